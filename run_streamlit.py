@@ -10,9 +10,10 @@ Or directly:
     streamlit run streamlit_app.py
 """
 
+import importlib.metadata
+import importlib.util
 import subprocess
 import sys
-import os
 from pathlib import Path
 
 def main():
@@ -24,17 +25,15 @@ def main():
         print("Please run this script from the project root directory.")
         return 1
     
-    # Check if streamlit is installed
-    try:
-        import streamlit
-        print(f"✅ Streamlit {streamlit.__version__} found")
-    except ImportError:
+    # Check if streamlit is installed (without paying for the import)
+    if importlib.util.find_spec("streamlit") is None:
         print("❌ Error: Streamlit not installed!")
         print("Please install it with: pip install streamlit")
         return 1
+    print(f"✅ Streamlit {importlib.metadata.version('streamlit')} found")
     
-    # Check if model file exists
-    model_path = Path("models/phi-3.gguf")
+    # Check if model file exists, resolved exactly as the app's loader does
+    from src.config import MODEL_PATH as model_path
     if not model_path.exists():
         print(f"⚠️  Warning: Model file not found at {model_path}")
         print("The debate system requires a GGUF model file to function.")
@@ -3,11 +3,26 @@ __version__ = "1.0.0"
 __author__ = "AI Debate System"
 __description__ = "A debate system using AutoGen's groupchat with multiple AI personalities powered by local GGUF models"
 
-from .main import main
-from .debate_manager import DebateManager
-from .agents import DebateAgentFactory
+import importlib
+
 from .config import AGENT_PERSONALITIES, MODEL_CONFIG
 
+# Heavy modules (autogen, llama_cpp, streamlit) are only imported on first access
+_LAZY_ATTRIBUTES = {
+    "main": ".main",
+    "DebateManager": ".debate_manager",
+    "DebateAgentFactory": ".agents",
+}
+
+def __getattr__(name):
+    """Import heavy package attributes lazily (PEP 562)."""
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     "main",
     "DebateManager", 
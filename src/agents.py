@@ -1,8 +1,12 @@
 """Custom AutoGen agents that use the local GGUF model."""
 
 import autogen
-from typing import Dict, Any, Optional, List
+import functools
+from typing import Dict, Any, Optional, List, Callable
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from .llm_wrapper import get_llm
 from .config import AGENT_PERSONALITIES, BASE_DEBATE_PROMPT, COLORS
 from .tools.tool_manager import get_tool_manager
@@ -11,6 +15,40 @@ from .tools.builtin_tools.web_search_tool import WebSearchTool
 
 logger = logging.getLogger(__name__)
 
+# Patterns used by LocalLLMAgent._clean_response, compiled once at import
+_ARTIFACT_ALTERNATION = r'(?:<\|(?:assistant|human|system|user|end)\|>|Assistant:|Human:|System:)'
+_ARTIFACT_PREFIX_RE = re.compile(r'^' + _ARTIFACT_ALTERNATION + r'\s*')
+_ARTIFACT_SUFFIX_RE = re.compile(r'\s*' + _ARTIFACT_ALTERNATION + r'$')
+_SQUARE_BRACKET_RE = re.compile(r'\[.*?\]')
+_PAREN_RE = re.compile(r'\(.*?\)')
+_BRACE_RE = re.compile(r'\{.*?\}')
+_META_COUNT_RE = re.compile(r'\b(?:generated|word count|words?|tokens?|characters?)\s*:?\s*\d+\b', re.IGNORECASE)
+_META_TRAILING_COUNT_RE = re.compile(r'\b\d+\s*(?:words?|tokens?|characters?)\s*(?:generated|produced|written)?\b', re.IGNORECASE)
+# Whole lines that look like metadata (word counts, timings), newline included;
+# only [ \t] is used inside so a match never spans lines
+_LINE_META_RE = re.compile(
+    r'^[ \t]*(?:\d+[ \t]*(?:words?|tokens?|characters?)'
+    r'|(?:generated|word count|tokens?|characters?|time|duration|elapsed)[ \t]*:?[ \t]*\d+)'
+    r'.*(?:\r?\n|$)',
+    re.IGNORECASE | re.MULTILINE
+)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+@functools.lru_cache(maxsize=None)
+def _compiled_system_message(personality_key: str) -> str:
+    """Build the full system message for a personality once and reuse it.
+    
+    Args:
+        personality_key: Key for personality configuration
+        
+    Returns:
+        Personality prompt followed by the shared debate protocol
+    """
+    return f"{AGENT_PERSONALITIES[personality_key]['personality']}\n\n{BASE_DEBATE_PROMPT}"
+
+# Agents may be built concurrently; only one of them should register the shared tools
+_tools_lock = threading.Lock()
+
 class LocalLLMAgent(autogen.ConversableAgent):
     """Custom AutoGen agent that uses our local GGUF model."""
     
@@ -31,7 +69,7 @@ class LocalLLMAgent(autogen.ConversableAgent):
         self._initialize_tools()
         
         # Create system message with tool context
-        combined_system_message = f"{self.personality['personality']}\n\n{BASE_DEBATE_PROMPT}"
+        combined_system_message = _compiled_system_message(personality_key)
         
         super().__init__(
             name=self.personality["name"],
@@ -42,8 +80,9 @@ class LocalLLMAgent(autogen.ConversableAgent):
             **kwargs
         )
         
+        self._name_prefix_re = re.compile(re.escape(self.name) + r':\s*')
+        
         # Override the generate_reply method to use our local LLM
-        self._original_generate_reply = self.generate_reply
         self.register_reply([autogen.Agent, None], self._custom_generate_reply)
     
     def _custom_generate_reply(
@@ -51,6 +90,7 @@ class LocalLLMAgent(autogen.ConversableAgent):
         messages: Optional[List[Dict]] = None,
         sender: Optional[autogen.Agent] = None,
         config: Optional[Any] = None,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> tuple[bool, str]:
         """Custom reply generation using local LLM.
         
@@ -58,6 +98,7 @@ class LocalLLMAgent(autogen.ConversableAgent):
             messages: Conversation messages
             sender: Sender agent
             config: Configuration
+            on_token: Optional callback receiving raw response chunks as they are generated
             
         Returns:
             Tuple of (success, response)
@@ -73,7 +114,8 @@ class LocalLLMAgent(autogen.ConversableAgent):
             response = self.llm.create_chat_completion_with_tools(
                 conversation_context,
                 self.tool_manager,
-                max_tool_calls=2
+                max_tool_calls=2,
+                on_token=on_token
             )
             
             # Clean up the response
@@ -126,38 +168,25 @@ class LocalLLMAgent(autogen.ConversableAgent):
         """
         response = response.strip()
         
-        if response.startswith(f"{self.name}:"):
-            response = response[len(f"{self.name}:"):].strip()
-        
-        artifacts = ["<|assistant|>", "<|human|>", "<|system|>", "<|user|>", "<|end|>", "Assistant:", "Human:", "System:", "\n\nHuman:", "\n\nAssistant:"]
-        for artifact in artifacts:
-            if response.startswith(artifact):
-                response = response[len(artifact):].strip()
-            if response.endswith(artifact):
-                response = response[:-len(artifact)].strip()
+        match = self._name_prefix_re.match(response)
+        if match:
+            response = response[match.end():]
         
-        import re
-        response = re.sub(r'\[.*?\]', '', response)
-        response = re.sub(r'\(.*?\)', '', response)
-        response = re.sub(r'\{.*?\}', '', response)
+        while match := _ARTIFACT_PREFIX_RE.match(response):
+            response = response[match.end():]
+        while match := _ARTIFACT_SUFFIX_RE.search(response):
+            response = response[:match.start()]
         
-        response = re.sub(r'\b(?:generated|word count|words?|tokens?|characters?)\s*:?\s*\d+\b', '', response, flags=re.IGNORECASE)
-        response = re.sub(r'\b\d+\s*(?:words?|tokens?|characters?)\s*(?:generated|produced|written)?\b', '', response, flags=re.IGNORECASE)
+        response = _SQUARE_BRACKET_RE.sub('', response)
+        response = _PAREN_RE.sub('', response)
+        response = _BRACE_RE.sub('', response)
         
-        lines = response.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            line = line.strip()
-            # Skip lines that look like metadata
-            if (re.match(r'^\d+\s*(?:words?|tokens?|characters?)', line, re.IGNORECASE) or
-                re.match(r'^(?:generated|word count|tokens?|characters?)\s*:?\s*\d+', line, re.IGNORECASE) or
-                re.match(r'^(?:time|duration|elapsed)\s*:?\s*\d+', line, re.IGNORECASE)):
-                continue
-            cleaned_lines.append(line)
+        response = _META_COUNT_RE.sub('', response)
+        response = _META_TRAILING_COUNT_RE.sub('', response)
         
-        response = '\n'.join(cleaned_lines)
+        response = _LINE_META_RE.sub('', response)
         
-        response = re.sub(r'\s+', ' ', response).strip()
+        response = _WHITESPACE_RE.sub(' ', response).strip()
         
         return response
     
@@ -166,24 +195,42 @@ class LocalLLMAgent(autogen.ConversableAgent):
     
     def _initialize_tools(self):
         """Initialize tools for the agent if not already done."""
-        if self.tool_manager.get_tool_count() == 0:
-            # Register the test tool
-            test_tool = TestTool()
-            self.tool_manager.register_tool(test_tool)
-            
-            # Register the web search tool
-            web_search_tool = WebSearchTool()
-            self.tool_manager.register_tool(web_search_tool)
-            
-            logger.info("Initialized tools for agents: test_tool, web_search")
-            print("🔧 [TOOLS] Registered tools: test_tool, web_search")
+        with _tools_lock:
+            if self.tool_manager.get_tool_count() == 0:
+                # Register the test tool
+                test_tool = TestTool()
+                self.tool_manager.register_tool(test_tool)
+                
+                # Register the web search tool
+                web_search_tool = WebSearchTool()
+                self.tool_manager.register_tool(web_search_tool)
+                
+                logger.info("Initialized tools for agents: test_tool, web_search")
+                print("🔧 [TOOLS] Registered tools: test_tool, web_search")
+
+@functools.lru_cache(maxsize=None)
+def _cached_agent(personality_key: str) -> LocalLLMAgent:
+    """Construct the agent for a personality once per process.
+    
+    Args:
+        personality_key: Key for the personality configuration
+        
+    Returns:
+        Shared LocalLLMAgent for that personality
+    """
+    return LocalLLMAgent(
+        name=AGENT_PERSONALITIES[personality_key]["name"],
+        personality_key=personality_key
+    )
 
 class DebateAgentFactory:
     """Factory for creating debate agents."""
     
     @staticmethod
     def create_agent(personality_key: str) -> LocalLLMAgent:
-        """Create an agent with the specified personality.
+        """Get the agent with the specified personality.
+        
+        Agents are built once per personality and reused by later calls.
         
         Args:
             personality_key: Key for the personality configuration
@@ -194,10 +241,12 @@ class DebateAgentFactory:
         if personality_key not in AGENT_PERSONALITIES:
             raise ValueError(f"Unknown personality: {personality_key}")
         
-        return LocalLLMAgent(
-            name=AGENT_PERSONALITIES[personality_key]["name"],
-            personality_key=personality_key
-        )
+        return _cached_agent(personality_key)
+    
+    @staticmethod
+    def invalidate_cache():
+        """Drop all cached agents so the next lookup builds fresh ones."""
+        _cached_agent.cache_clear()
     
     @staticmethod
     def create_all_agents() -> Dict[str, LocalLLMAgent]:
@@ -206,11 +255,14 @@ class DebateAgentFactory:
         Returns:
             Dictionary mapping personality keys to agents
         """
-        agents = {}
-        for personality_key in AGENT_PERSONALITIES:
-            if personality_key not in ["moderator", "judge"]:  # Create moderator and judge separately if needed
-                agents[personality_key] = DebateAgentFactory.create_agent(personality_key)
-        return agents
+        # Create moderator and judge separately if needed
+        keys = [key for key in AGENT_PERSONALITIES if key not in ["moderator", "judge"]]
+        
+        # Construction is I/O-bound (model load, tool setup), so overlap it across threads
+        with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+            futures = {key: executor.submit(DebateAgentFactory.create_agent, key) for key in keys}
+        
+        return {key: future.result() for key, future in futures.items()}
     
     @staticmethod
     def create_judge() -> LocalLLMAgent:
@@ -1,21 +1,31 @@
 """Configuration settings for the debate system."""
 
+import functools
 import os
 from pathlib import Path
 
 # Model configuration
-MODEL_PATH = Path(__file__).parent.parent / "models" / "phi-3.gguf"
+MODEL_QUANT = os.environ.get("DEBATELAB_QUANT", "Q4_K_M")  # Q5_K_M for CPU-only, Q8_0 for GPUs with headroom
+MODEL_PATH = Path(os.environ.get(
+    "DEBATELAB_MODEL",
+    Path(__file__).parent.parent / "models" / f"phi-3-{MODEL_QUANT}.gguf"
+))
 MODEL_CONFIG = {
     "model_path": str(MODEL_PATH),
     "n_ctx": 2048,             # Max it out if you want agents to retain more context in memory
-    # "n_threads": 16,            # Use number of physical cores or logical threads on your machine
+    "n_threads": min(os.cpu_count() or 4, 16),  # Generation threads; more than ~16 only adds contention
+    "n_threads_batch": os.cpu_count() or 4,      # Prompt processing scales with every available core
     "temperature": 0.9,        # Slightly lower for more focused but still personality-rich responses
-    "max_tokens": 700,        # Increased to allow for longer, more detailed responses
+    "max_tokens": 400,         # ~250 words plus headroom; the prompt asks for 200–250 words
     "top_p": 0.9,              # Keep top-p relatively high for diverse output
     "top_k": 60,               # Slightly tighter control on sampling
     "repeat_penalty": 1.1,     # Slightly higher to avoid agents repeating themselves in debates
+    "stop": ["<|end|>", "<|user|>", "<|human|>", "<|assistant|>", "<|system|>", "\n\nHuman:"],
     "verbose": False,
-    "n_gpu_layers": 64
+    "n_gpu_layers": int(os.environ.get("DEBATELAB_NGL", "-1")),  # -1 offloads every layer to the GPU
+    "n_batch": 2048,           # Prompt-eval batch size; larger batches keep the GPU busy during prefill
+    "main_gpu": 0,
+    "prompt_cache_bytes": 0    # RAM for saved KV states so repeated prompt prefixes skip prefill (e.g. 1 << 30); 0 disables
 }
 
 # Base prompt shared by all debate participants
@@ -119,6 +129,7 @@ COLORS = {
 }
 
 # Prompt templates for debate manager
+@functools.lru_cache(maxsize=256)
 def get_initial_debate_message(topic: str) -> str:
     """Get the initial debate message template."""
     return f"""Welcome to today's debate! Our topic is: "{topic}"
@@ -128,6 +139,7 @@ Remember to be respectful and build upon each other's ideas.
 
 Who would like to start with their opening thoughts?"""
 
+@functools.lru_cache(maxsize=256)
 def get_starter_context_prompt(topic: str) -> str:
     """Get the starter context prompt template."""
     return f"""Topic: {topic}
@@ -146,6 +158,7 @@ Your responsibilities as the opening speaker:
 
 Now begin your opening statement:"""
 
+@functools.lru_cache(maxsize=256)
 def get_starter_selection_prompt(topic: str) -> str:
     """Get the starter selection prompt template."""
     return f"""Given the debate topic: "{topic}"
@@ -187,15 +200,21 @@ Judge's question: {question}
 Please provide a brief clarification that addresses the judge's concern while staying true to your personality."""
 
 def get_agent_context_instructions() -> str:
-    """Get the standard instructions for agents during their turn."""
+    """Get the standard instructions for agents during their turn.
+    
+    Kept free of per-turn content so it can sit in the reusable prompt prefix;
+    the response cue that follows the conversation summary is separate.
+    """
     return """\nAs the current speaker, your role is to:
 - Respond directly to the strongest arguments made in the previous round.
 - Present your position clearly, using specific reasoning or examples.
 - Identify any flawed logic or missing perspectives, and explain why they matter.
 - Add new insights that move the discussion forward.
-- Stay fully in character and consistent with your assigned personality.
+- Stay fully in character and consistent with your assigned personality."""
 
-Now deliver your response:"""
+def get_agent_response_cue() -> str:
+    """Get the closing line that asks the current speaker to respond."""
+    return "\nNow deliver your response:"
 
 def get_moderator_intervention_instructions() -> str:
     """Get the instructions for moderator intervention."""
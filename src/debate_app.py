@@ -5,15 +5,19 @@ import os
 sys.path.append(os.path.abspath("."))
 
 import streamlit as st
+import copy
+import re
 import tempfile
 import time
 from datetime import datetime
+from itertools import islice
+from pathlib import Path
 from src.debate_manager import DebateManager
 from src.config import MODEL_PATH, AGENT_PERSONALITIES
+from src.llm_wrapper import get_llm
 
-def apply_custom_css():
-    """Apply custom CSS styling - called after page config."""
-    st.markdown("""<style>
+# Static stylesheet for the app; built once at import
+CUSTOM_CSS = """
     /* Global background with modern dark theme */
     .stApp {
         background: linear-gradient(135deg, #0f0f23 0%, #1a1a2e 50%, #16213e 100%);
@@ -21,6 +25,8 @@ def apply_custom_css():
     }
     
     .main .block-container {
+        /* The only blurred layers are this container and the sidebar; cards inside
+           stay translucent over it rather than running their own blur pass */
         background: rgba(255, 255, 255, 0.02);
         border: 1px solid rgba(255, 255, 255, 0.1);
         border-radius: 24px;
@@ -51,11 +57,14 @@ def apply_custom_css():
         margin: 1.2rem 0;
         border-radius: 20px;
         border: 1px solid rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(15px);
+        /* Variants below only set --agent-color; tint and border derive from it */
+        background: linear-gradient(135deg,
+            color-mix(in srgb, var(--agent-color) 10%, transparent) 0%,
+            color-mix(in srgb, var(--agent-color) 5%, transparent) 100%);
+        border-color: color-mix(in srgb, var(--agent-color) 20%, transparent);
         box-shadow: 0 8px 32px rgba(0, 0, 0, 0.2);
         position: relative;
         overflow: hidden;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
     }
     
     .agent-message::before {
@@ -74,45 +83,11 @@ def apply_custom_css():
         box-shadow: 0 12px 48px rgba(0, 0, 0, 0.3);
     }
     
-    .optimist-message {
-        --agent-color: #10b981;
-        background: linear-gradient(135deg, 
-            rgba(16, 185, 129, 0.1) 0%, 
-            rgba(5, 150, 105, 0.05) 100%);
-        border-color: rgba(16, 185, 129, 0.2);
-    }
-    
-    .skeptic-message {
-        --agent-color: #f59e0b;
-        background: linear-gradient(135deg, 
-            rgba(245, 158, 11, 0.1) 0%, 
-            rgba(217, 119, 6, 0.05) 100%);
-        border-color: rgba(245, 158, 11, 0.2);
-    }
-    
-    .ethicist-message {
-        --agent-color: #8b5cf6;
-        background: linear-gradient(135deg, 
-            rgba(139, 92, 246, 0.1) 0%, 
-            rgba(124, 58, 237, 0.05) 100%);
-        border-color: rgba(139, 92, 246, 0.2);
-    }
-    
-    .judge-message {
-        --agent-color: #ef4444;
-        background: linear-gradient(135deg, 
-            rgba(239, 68, 68, 0.1) 0%, 
-            rgba(220, 38, 38, 0.05) 100%);
-        border-color: rgba(239, 68, 68, 0.2);
-    }
-    
-    .moderator-message {
-        --agent-color: #06b6d4;
-        background: linear-gradient(135deg, 
-            rgba(6, 182, 212, 0.1) 0%, 
-            rgba(8, 145, 178, 0.05) 100%);
-        border-color: rgba(6, 182, 212, 0.2);
-    }
+    .optimist-message { --agent-color: #10b981; }
+    .skeptic-message { --agent-color: #f59e0b; }
+    .ethicist-message { --agent-color: #8b5cf6; }
+    .judge-message { --agent-color: #ef4444; }
+    .moderator-message { --agent-color: #06b6d4; }
     
     .agent-name {
         font-weight: 700;
@@ -156,7 +131,6 @@ def apply_custom_css():
         text-align: center;
         font-weight: 600;
         color: #a5b4fc;
-        backdrop-filter: blur(10px);
         box-shadow: 0 4px 16px rgba(99, 102, 241, 0.1);
     }
     
@@ -169,7 +143,6 @@ def apply_custom_css():
         font-weight: 700 !important;
         font-size: 1rem !important;
         box-shadow: 0 4px 16px rgba(239, 68, 68, 0.4) !important;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
         text-transform: uppercase !important;
         letter-spacing: 0.05em !important;
     }
@@ -185,7 +158,6 @@ def apply_custom_css():
         padding: 1.5rem;
         border-radius: 16px;
         margin: 1.5rem 0;
-        backdrop-filter: blur(15px);
         box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1);
     }
     
@@ -199,7 +171,6 @@ def apply_custom_css():
         margin: 1.5rem 0;
         font-style: italic;
         color: #9ca3af;
-        backdrop-filter: blur(10px);
         box-shadow: 0 4px 16px rgba(156, 163, 175, 0.1);
     }
     
@@ -211,7 +182,6 @@ def apply_custom_css():
         padding: 1rem;
         border-radius: 12px;
         margin: 1rem 0;
-        backdrop-filter: blur(10px);
         box-shadow: 0 4px 16px rgba(59, 130, 246, 0.1);
         color: #93c5fd;
         animation: shimmer 2s infinite;
@@ -232,7 +202,6 @@ def apply_custom_css():
             rgba(59, 130, 246, 0.1) 0%,
             rgba(147, 51, 234, 0.1) 100%);
         border: 1px solid rgba(59, 130, 246, 0.2);
-        backdrop-filter: blur(10px);
     }
     
     .loading-text {
@@ -308,8 +277,6 @@ def apply_custom_css():
         font-weight: 600 !important;
         font-size: 0.95rem !important;
         box-shadow: 0 4px 16px rgba(59, 130, 246, 0.2) !important;
-        backdrop-filter: blur(10px) !important;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
         text-transform: uppercase !important;
         letter-spacing: 0.025em !important;
     }
@@ -332,7 +299,6 @@ def apply_custom_css():
         border: 1px solid rgba(255, 255, 255, 0.1) !important;
         border-radius: 10px !important;
         color: #e5e7eb !important;
-        backdrop-filter: blur(10px) !important;
     }
     
     .stSidebar .stTextInput > div > div > input {
@@ -340,7 +306,6 @@ def apply_custom_css():
         border: 1px solid rgba(255, 255, 255, 0.1) !important;
         border-radius: 10px !important;
         color: #e5e7eb !important;
-        backdrop-filter: blur(10px) !important;
     }
     
     .stSidebar .stTextInput > div > div > input:focus {
@@ -390,7 +355,6 @@ def apply_custom_css():
         background: rgba(255, 255, 255, 0.02) !important;
         border: 1px solid rgba(255, 255, 255, 0.1) !important;
         border-radius: 16px !important;
-        backdrop-filter: blur(15px) !important;
         box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1) !important;
         color: #e5e7eb !important;
         padding: 1rem !important; /* Reduce padding */
@@ -437,7 +401,6 @@ def apply_custom_css():
     .stAlert {
         background: rgba(255, 255, 255, 0.02) !important;
         border: 1px solid rgba(255, 255, 255, 0.1) !important;
-        backdrop-filter: blur(15px) !important;
         border-radius: 16px !important;
         box-shadow: 0 4px 16px rgba(0, 0, 0, 0.1) !important;
         color: #e5e7eb !important;
@@ -449,14 +412,12 @@ def apply_custom_css():
         border: 1px solid rgba(255, 255, 255, 0.1) !important;
         border-radius: 12px !important;
         color: #e5e7eb !important;
-        backdrop-filter: blur(10px) !important;
     }
     
     .streamlit-expanderContent {
         background: rgba(255, 255, 255, 0.02) !important;
         border: 1px solid rgba(255, 255, 255, 0.1) !important;
         border-top: none !important;
-        backdrop-filter: blur(15px) !important;
         border-radius: 0 0 12px 12px !important;
         color: #d1d5db !important;
     }
@@ -489,201 +450,325 @@ def apply_custom_css():
     .agent-message:hover .agent-name {
         text-shadow: 0 0 10px var(--agent-color);
     }
+
+    /* Transitions only on the elements that animate, and only the properties they change */
+    .agent-message, .stop-button, .stSidebar .stButton > button {
+        transition: transform 0.3s cubic-bezier(0.4, 0, 0.2, 1), box-shadow 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+    }
     
-    /* Smooth transitions for all interactive elements */
-    * {
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+    .agent-name {
+        transition: text-shadow 0.3s cubic-bezier(0.4, 0, 0.2, 1);
     }
-</style>
-    """, unsafe_allow_html=True)
+"""
+
+def _minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet.
+    
+    Whitespace before ':' is kept since it is significant in selectors.
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.strip()
+
+# Minified once at import; this is what actually ships on every rerun
+_STYLE_TAG = f"<style>{_minify_css(CUSTOM_CSS)}</style>"
+
+def apply_custom_css():
+    """Apply custom CSS styling - called after page config."""
+    st.markdown(_STYLE_TAG, unsafe_allow_html=True)
+
+@st.cache_resource(show_spinner="Loading model...", max_entries=1)
+def load_llm():
+    """Load the shared GGUF model once per server process."""
+    return get_llm()
+
+@st.cache_data(ttl=60, max_entries=4, show_spinner=False)
+def _model_available(path_str: str) -> bool:
+    """Check for the model file at most once a minute instead of on every rerun."""
+    return Path(path_str).exists()
+
+# Past debates kept per session
+MAX_DEBATE_HISTORY = 20
+
+# Initial session state; mutable defaults are copied so sessions never share them
+_SESSION_DEFAULTS = {
+    "debate_history": [],
+    "debate_running": False,
+    "uploaded_content": None,
+    "stop_debate": False,
+}
 
 def initialize_session_state():
     """Initialize Streamlit session state."""
-    if "debate_history" not in st.session_state:
-        st.session_state.debate_history = []
-    if "debate_running" not in st.session_state:
-        st.session_state.debate_running = False
-    if "uploaded_content" not in st.session_state:
-        st.session_state.uploaded_content = None
-    if "stop_debate" not in st.session_state:
-        st.session_state.stop_debate = False
+    for key, default in _SESSION_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = copy.copy(default)
+
+@st.cache_data(show_spinner="Processing document...", max_entries=8, ttl=3600)
+def _extract_text(file_bytes: bytes, filename: str) -> str:
+    """Extract normalized text from an uploaded document.
+    
+    Plain text is decoded directly; other formats go through textract via a
+    temporary file. Cached on the file contents, so reruns don't parse the same
+    document again. Raises ImportError when textract is needed but not installed.
+    """
+    suffix = filename.rsplit('.', 1)[-1].lower()
+    if suffix == "txt":
+        content = file_bytes.decode("utf-8", errors="ignore")
+    else:
+        import textract
+        
+        with tempfile.NamedTemporaryFile(suffix="." + suffix, delete=False) as tmp:
+            tmp.write(file_bytes)
+            tmp_path = tmp.name
+        try:
+            content = textract.process(tmp_path).decode("utf-8", errors="ignore")
+        finally:
+            os.unlink(tmp_path)
+    
+    content = " ".join(content.split())
+    return content[:2000]  # Limit content length
 
 def process_uploaded_file(uploaded_file):
     """Process uploaded file and extract content."""
     try:
-        # Try to use textract if available
-        try:
-            import textract
-            
-            with tempfile.NamedTemporaryFile(
-                suffix="." + uploaded_file.name.split('.')[-1],
-                delete=False
-            ) as tmp:
-                tmp.write(uploaded_file.getbuffer())
-                tmp.flush()
-                tmp_path = tmp.name
-            
-            text_bytes = textract.process(tmp_path)
-            content = text_bytes.decode("utf-8", errors="ignore")
-            content = " ".join(content.split())
-            
-            st.session_state.uploaded_content = {
-                "filename": uploaded_file.name,
-                "content": content[:2000]  # Limit content length
-            }
-            
-            st.success(f"✅ File processed: {uploaded_file.name}")
-            
-        except ImportError:
-            # Fallback for text files
-            if uploaded_file.type == "text/plain":
-                content = str(uploaded_file.read(), "utf-8")
-                st.session_state.uploaded_content = {
-                    "filename": uploaded_file.name,
-                    "content": content[:2000]
-                }
-                st.success(f"✅ Text file processed: {uploaded_file.name}")
-            else:
-                st.warning("⚠️ textract not available. Only plain text files supported.")
-                
+        content = _extract_text(uploaded_file.getvalue(), uploaded_file.name)
+        
+        st.session_state.uploaded_content = {
+            "filename": uploaded_file.name,
+            "content": content
+        }
+        
+        st.success(f"✅ File processed: {uploaded_file.name}")
+        
+    except ImportError:
+        st.warning("⚠️ textract not available. Only plain text files supported.")
     except Exception as e:
         st.error(f"❌ Error processing file: {e}")
 
+# Per-speaker lookups used on every rendered message
+AGENT_AVATARS = {
+    "Alex the Optimist": "😊",
+    "Sam the Skeptic": "🤔",
+    "Dr. Elena Ethics": "⚖️",
+    "Judge Sophia": "👩‍⚖️",
+    "Morgan the Moderator": "🎯"
+}
+
+# Maps speakers onto the .<class>-message rules in CUSTOM_CSS
+AGENT_CSS_CLASS = {
+    "Alex the Optimist": "optimist",
+    "Sam the Skeptic": "skeptic",
+    "Dr. Elena Ethics": "ethicist",
+    "Judge Sophia": "judge",
+    "Morgan the Moderator": "moderator"
+}
+
+# Sidebar participant list is keyed by personality rather than display name
+_SIDEBAR_EMOJI = {
+    "optimist": "😊",
+    "skeptic": "🤔",
+    "ethicist": "⚖️",
+    "judge": "👩‍⚖️"
+}
+
 def get_agent_avatar(agent_name: str) -> str:
     """Get emoji avatar for agent."""
-    avatars = {
-        "Alex the Optimist": "😊",
-        "Sam the Skeptic": "🤔", 
-        "Dr. Elena Ethics": "⚖️",
-        "Judge Sophia": "👩‍⚖️",
-        "Morgan the Moderator": "🎯"
-    }
-    return avatars.get(agent_name, "🤖")
+    return AGENT_AVATARS.get(agent_name, "🤖")
 
 # Removed get_agent_response_streamlit - now using existing backend system
 
-def run_debate_display(debate_manager, topic):
-    """Run debate using the existing backend with Streamlit display."""
+def render_stop_controls(display_adapter):
+    """Render the stop button and status panel.
     
-    # Create a custom display adapter for Streamlit
-    class StreamlitDisplayAdapter:
-        def __init__(self):
-            self.messages = []
-            self.stop_requested = False
-            self.current_loading_placeholder = None
+    Deliberately not a fragment: a click must trigger a full-app rerun, which
+    is what interrupts the run currently executing the debate loop.
+    """
+    st.markdown('<div class="debate-controls">', unsafe_allow_html=True)
+    col1, col2, col3 = st.columns([2, 2, 2])
+    
+    with col1:
+        if st.button("⏹️ Stop Debate", key="main_stop_btn", type="secondary", help="Click to stop the debate at any time"):
+            st.session_state.stop_debate = True
+            display_adapter.stop_requested = True
+            st.warning("🛑 Debate stop requested...")
+    
+    with col2:
+        if st.session_state.get("stop_debate", False):
+            st.markdown("**Status:** Stopping...")
+        else:
+            st.markdown("**Status:** Running")
+    
+    with col3:
+        st.markdown("**Mode:** AI Debate")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# Minimum seconds between redraws of a streaming reply
+STREAM_FLUSH_INTERVAL = 0.05
+
+# Placeholder bubble shown while a speaker's reply is being generated
+_GENERATING_HTML_TPL = (
+    '<div class="agent-message {agent_class}-message">'
+    '<div class="loading-text">'
+    '<span class="loading-dots">💭 Generating response</span>'
+    '<div class="loading-animation">'
+    '<span class="dot">.</span><span class="dot">.</span><span class="dot">.</span>'
+    '</div>'
+    '</div>'
+    '</div>'
+)
+
+class StreamlitDisplayAdapter:
+    """Display backend that renders debate output into the Streamlit page."""
+    
+    def __init__(self):
+        self.messages = []
+        self.stop_requested = False
+        self.current_loading_placeholder = None
+        self.stream_placeholder = None
+        self.stream_chunks = []
+        self.last_stream_flush = 0.0
+    
+    def show_debate_header(self, topic: str, participants: list):
+        """Display the debate header with topic and participants."""
+        st.markdown(f'<div class="system-message">🎭 <strong>Debate Topic:</strong> {topic}</div>', unsafe_allow_html=True)
+        participant_names = ", ".join(participants)
+        st.markdown(f'<div class="system-message">👥 <strong>Participants:</strong> {participant_names}</div>', unsafe_allow_html=True)
+    
+    def show_exchange_header(self, exchange_num: int):
+        """Display the exchange header."""
+        st.markdown(f'<div class="system-message">🔄 <strong>Exchange {exchange_num}</strong></div>', unsafe_allow_html=True)
+    
+    def show_generating_indicator(self, speaker: str):
+        """Show generating response indicator for the next speaker."""
+        if st.session_state.get("stop_debate", False):
+            return
         
-        def show_debate_header(self, topic: str, participants: list):
-            """Display the debate header with topic and participants."""
-            st.markdown(f'<div class="system-message">🎭 <strong>Debate Topic:</strong> {topic}</div>', unsafe_allow_html=True)
-            participant_names = ", ".join(participants)
-            st.markdown(f'<div class="system-message">👥 <strong>Participants:</strong> {participant_names}</div>', unsafe_allow_html=True)
+        avatar = get_agent_avatar(speaker)
         
-        def show_exchange_header(self, exchange_num: int):
-            """Display the exchange header."""
-            st.markdown(f'<div class="system-message">🔄 <strong>Exchange {exchange_num}</strong></div>', unsafe_allow_html=True)
+        # Clear any existing loading placeholder
+        if self.current_loading_placeholder:
+            self.current_loading_placeholder.empty()
         
-        def show_generating_indicator(self, speaker: str):
-            """Show generating response indicator for the next speaker."""
-            if st.session_state.get("stop_debate", False):
-                return
-            
-            avatar = get_agent_avatar(speaker)
-            
-            # Clear any existing loading placeholder
-            if self.current_loading_placeholder:
-                self.current_loading_placeholder.empty()
-            
-            # Create new loading placeholder
-            self.current_loading_placeholder = st.empty()
-            
-            with self.current_loading_placeholder.container():
-                with st.chat_message("assistant", avatar=avatar):
-                    st.markdown(f'<div class="agent-name">{speaker}:</div>', unsafe_allow_html=True)
-                    st.markdown(f"""
-                    <div class="agent-message {speaker}-message">
-                        <div class="loading-text">
-                            <span class="loading-dots">💭 Generating response</span>
-                            <div class="loading-animation">
-                                <span class="dot">.</span>
-                                <span class="dot">.</span>
-                                <span class="dot">.</span>
-                            </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-        
-        def show_message(self, speaker: str, message: str, color_key: str = None, streaming: bool = True):
-            """Display a message from a speaker."""
-            if st.session_state.get("stop_debate", False):
-                self.stop_requested = True
-                return
-            
-            # Clear loading indicator if it exists
-            if self.current_loading_placeholder:
-                self.current_loading_placeholder.empty()
-                self.current_loading_placeholder = None
-                
-            # Store message
-            message_entry = {
-                "name": speaker,
-                "content": message,
-                "timestamp": datetime.now().isoformat()
-            }
-            self.messages.append(message_entry)
-            
-            # Display in Streamlit
-            if speaker == "System":
-                st.markdown(f'<div class="system-message">🎭 <h6>System:</h6> \n{message}</div>', unsafe_allow_html=True)
-            else:
-                avatar = get_agent_avatar(speaker)
-                agent_class = speaker.lower().replace(" ", "-").replace("the", "").replace("dr.", "").replace(".", "").strip()
-                
-                with st.chat_message("assistant", avatar=avatar):
-                    st.markdown(f'<div class="agent-name">{speaker}:</div>', unsafe_allow_html=True)
-                    st.markdown(f'<div class="agent-message {agent_class}-message">{message}</div>', unsafe_allow_html=True)
-        
-        def show_debate_footer(self, total_rounds: int):
-            """Display the debate conclusion."""
-            st.markdown(f'<div class="system-message">🏁 <strong>Debate Concluded</strong> - Total Rounds: {total_rounds}</div>', unsafe_allow_html=True)
-        
-        def show_error(self, error_message: str):
-            """Display an error message."""
-            st.error(f"⚠️ ERROR: {error_message}")
-        
-        def show_loading(self, message: str):
-            """Display a loading message."""
-            st.info(f"⏳ {message}...")
-        
-        def show_success(self, message: str):
-            """Display a success message."""
-            st.success(f"✅ {message}")
-    
-    # Replace the debate manager's display with our Streamlit adapter
-    original_display = debate_manager.display
-    streamlit_display = StreamlitDisplayAdapter()
-    debate_manager.display = streamlit_display
-    
-    # Create control panel with stop button
-    stop_container = st.container()
-    with stop_container:
-        st.markdown('<div class="debate-controls">', unsafe_allow_html=True)
-        col1, col2, col3 = st.columns([2, 2, 2])
+        # Create new loading placeholder
+        self.current_loading_placeholder = st.empty()
         
-        with col1:
-            if st.button("⏹️ Stop Debate", key="main_stop_btn", type="secondary", help="Click to stop the debate at any time"):
-                st.session_state.stop_debate = True
-                streamlit_display.stop_requested = True
-                st.warning("🛑 Debate stop requested...")
+        # The bubble below is reused for streamed tokens once generation starts
+        self.stream_chunks = []
+        with self.current_loading_placeholder.container():
+            with st.chat_message("assistant", avatar=avatar):
+                st.markdown(f'<div class="agent-name">{speaker}:</div>', unsafe_allow_html=True)
+                self.stream_placeholder = st.empty()
+                self.stream_placeholder.markdown(
+                    _GENERATING_HTML_TPL.format(agent_class=AGENT_CSS_CLASS.get(speaker, "system")),
+                    unsafe_allow_html=True
+                )
+    
+    def show_token(self, speaker: str, token: str):
+        """Grow the speaker's bubble with a newly generated chunk of text."""
+        if self.stream_placeholder is None or st.session_state.get("stop_debate", False):
+            return
         
-        with col2:
-            if st.session_state.get("stop_debate", False):
-                st.markdown("**Status:** Stopping...")
-            else:
-                st.markdown("**Status:** Running")
+        self.stream_chunks.append(token)
         
-        with col3:
-            st.markdown("**Mode:** AI Debate")
+        # Redraw at most ~20 times a second; show_message renders the final text
+        now = time.monotonic()
+        if now - self.last_stream_flush < STREAM_FLUSH_INTERVAL:
+            return
+        self.last_stream_flush = now
+        
+        agent_class = AGENT_CSS_CLASS.get(speaker, "system")
+        self.stream_placeholder.markdown(
+            f'<div class="agent-message {agent_class}-message">{"".join(self.stream_chunks)}</div>',
+            unsafe_allow_html=True
+        )
+    
+    def show_message(self, speaker: str, message: str, color_key: str = None, streaming: bool = True):
+        """Display a message from a speaker."""
+        if st.session_state.get("stop_debate", False):
+            self.stop_requested = True
+            return
+        
+        # Clear loading indicator if it exists
+        if self.current_loading_placeholder:
+            self.current_loading_placeholder.empty()
+            self.current_loading_placeholder = None
+        self.stream_placeholder = None
+        self.stream_chunks = []
+        
+        # Store message
+        message_entry = {
+            "name": speaker,
+            "content": message,
+            "timestamp": time.time()  # Converted to ISO when the debate is saved
+        }
+        self.messages.append(message_entry)
         
-        st.markdown('</div>', unsafe_allow_html=True)
+        # Display in Streamlit
+        if speaker == "System":
+            st.markdown(f'<div class="system-message">🎭 <h6>System:</h6> \n{message}</div>', unsafe_allow_html=True)
+        else:
+            avatar = get_agent_avatar(speaker)
+            agent_class = AGENT_CSS_CLASS.get(speaker, "system")
+            
+            # One markdown element per turn instead of separate name/body elements
+            with st.chat_message("assistant", avatar=avatar):
+                st.markdown(
+                    f'<div class="agent-name">{speaker}:</div>'
+                    f'<div class="agent-message {agent_class}-message">{message}</div>',
+                    unsafe_allow_html=True
+                )
+    
+    def show_debate_footer(self, total_rounds: int):
+        """Display the debate conclusion."""
+        st.markdown(f'<div class="system-message">🏁 <strong>Debate Concluded</strong> - Total Rounds: {total_rounds}</div>', unsafe_allow_html=True)
+    
+    def show_error(self, error_message: str):
+        """Display an error message."""
+        st.error(f"⚠️ ERROR: {error_message}")
+    
+    def show_loading(self, message: str):
+        """Display a loading message."""
+        st.info(f"⏳ {message}...")
+    
+    def show_success(self, message: str):
+        """Display a success message."""
+        st.success(f"✅ {message}")
+
+@st.cache_data(show_spinner=False, max_entries=MAX_DEBATE_HISTORY)
+def _render_history_debate(timestamp: str, topic: str, _conversation: list):
+    """Render a finished debate's transcript.
+    
+    Saved debates never change, so the elements are cached on the save timestamp
+    and topic and replayed on later reruns. The transcript itself is excluded
+    from hashing (leading underscore) to avoid rehashing every message.
+    
+    Args:
+        timestamp: ISO timestamp the debate was saved under
+        topic: The debate topic
+        _conversation: Saved messages with name and content keys
+    """
+    st.write(f"**Messages:** {len(_conversation)}")
+    
+    # Show conversation
+    for msg in _conversation:
+        if msg['name'] == 'System':
+            st.info(f"**System:** {msg['content']}")
+        else:
+            avatar = get_agent_avatar(msg['name'])
+            st.write(f"{avatar} **{msg['name']}:** {msg['content']}")
+
+def run_debate_display(debate_manager, topic):
+    """Run debate using the existing backend with Streamlit display.
+    
+    The manager must have been created with a StreamlitDisplayAdapter.
+    """
+    
+    # Create control panel with stop button
+    render_stop_controls(debate_manager.display)
     
     # Reset stop flag at start
     if "stop_debate" not in st.session_state:
@@ -694,18 +779,135 @@ def run_debate_display(debate_manager, topic):
         conversation_history = debate_manager.start_debate()
         
         # Return the messages from our adapter
-        return streamlit_display.messages
+        return debate_manager.display.messages
         
     except Exception as e:
         st.error(f"❌ Error during debate: {e}")
         return []
     
     finally:
-        # Restore original display
-        debate_manager.display = original_display
         # Reset stop flag after debate ends
         st.session_state.stop_debate = False
 
+# Splits SummaryManager.get_detailed_summary() output into (number, body) pairs
+_EXCHANGE_RE = re.compile(r'Exchange\s+(\d+)\s*:\s*(.*?)(?=\nExchange\s+\d+\s*:|\Z)', re.DOTALL)
+
+def _normalize_detailed_summary(detailed_summary) -> dict:
+    """Flatten a detailed summary into exchange number -> text.
+    
+    Accepts either the combined "Exchange N: ..." string or a dict keyed by
+    exchange whose values are strings or dicts with a 'summary' key.
+    
+    Args:
+        detailed_summary: The 'detailed_summary' entry of a debate summary
+        
+    Returns:
+        Non-empty exchange summaries keyed by exchange number, in exchange order
+    """
+    if not detailed_summary:
+        return {}
+    
+    if isinstance(detailed_summary, str):
+        # One pass over the combined "Exchange N: ..." string
+        pairs = ((match.group(1), match.group(2)) for match in _EXCHANGE_RE.finditer(detailed_summary))
+    else:
+        pairs = (
+            (num, value['summary'] if isinstance(value, dict) and 'summary' in value else str(value))
+            for num, value in sorted(detailed_summary.items())
+        )
+    
+    return {int(num): text.strip() for num, text in pairs if text and text.strip()}
+
+@st.fragment
+def _render_summary(summary: dict, conversation_history: list, exchange_summaries: dict):
+    """Render the post-debate summary expander.
+    
+    Runs as a fragment so interactions here don't rerun the history panel.
+    Exchange summaries arrive pre-normalized so reruns skip the parsing.
+    """
+    participants = summary.get('participants') or []
+    
+    # Main summary dropdown
+    with st.expander("📊 **Debate Summary & Statistics**", expanded=False):
+        st.markdown("### 📈 Quick Overview")
+        
+        # Basic metrics in a compact layout
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("💬 Messages", summary.get('total_messages', len(conversation_history)))
+        with col2:
+            exchanges = summary.get('total_exchanges')
+            if exchanges is None:
+                exchanges = sum(1 for m in conversation_history if m['name'] != 'System')
+            st.metric("🔄 Exchanges", exchanges)
+        with col3:
+            st.metric("👥 Participants", len(participants))
+        with col4:
+            st.metric("🎯 Status", "✅ Complete" if len(conversation_history) > 2 else "⚠️ Partial")
+        
+        st.divider()
+        
+        # Detailed summaries section
+        if exchange_summaries:
+            st.markdown("### 📝 Exchange Summaries")
+            st.markdown("\n\n".join(
+                f"**🔍 Exchange {exchange_num}:**\n\n{content}\n\n---"
+                for exchange_num, content in exchange_summaries.items()
+            ))
+        
+        st.divider()
+        
+        # Summary statistics section
+        summary_stats = summary.get('summary_stats') or {}
+        if summary_stats:
+            st.markdown("### 📊 Detailed Statistics")
+            
+            brief_summaries = summary_stats.get('brief_summaries')
+            total_words = summary_stats.get('total_words')
+            detailed_summaries = summary_stats.get('detailed_summaries')
+            avg_summary_length = summary_stats.get('avg_summary_length')
+            exchanges_covered = summary_stats.get('exchanges_covered')
+            
+            stats_col1, stats_col2, stats_col3 = st.columns(3)
+            
+            with stats_col1:
+                if brief_summaries is not None:
+                    st.metric("📋 Brief Summaries", brief_summaries)
+                if total_words is not None:
+                    st.metric("📝 Total Words", total_words)
+            
+            with stats_col2:
+                if detailed_summaries is not None:
+                    st.metric("📄 Detailed Summaries", detailed_summaries)
+                if avg_summary_length is not None:
+                    st.metric("📏 Avg Summary Length", f"{avg_summary_length} words")
+            
+            with stats_col3:
+                if exchanges_covered is not None:
+                    st.metric("🔄 Exchanges Covered", exchanges_covered)
+                # Add participants list
+                if participants:
+                    st.metric("👥 Participant Count", len(participants))
+            
+            # Show participant list
+            if participants:
+                st.markdown("**🎭 Participants:**")
+                participant_text = " • ".join(participants)
+                st.write(participant_text)
+
+@st.fragment
+def _render_history():
+    """Render the most recent debates from session history.
+    
+    Runs as a fragment so interactions here don't rerun the summary panel.
+    """
+    if st.session_state.debate_history:
+        st.header("📚 Recent Debates")
+        
+        for debate in islice(reversed(st.session_state.debate_history), 3):  # Show last 3
+            with st.expander(f"🎭 {debate['topic']} - {debate['timestamp'][:19]}"):
+                _render_history_debate(debate['timestamp'], debate['topic'], debate['conversation'])
+
 def main():
     """Main Streamlit app."""
     # Page config MUST be first
@@ -726,7 +928,7 @@ def main():
     st.markdown('<p style="text-align: center; font-size: 1.2rem; color: #6c757d; margin-bottom: 2rem;"><em>AI-powered debate system with multiple agent personalities</em></p>', unsafe_allow_html=True)
     
     # Check model availability
-    if not MODEL_PATH.exists():
+    if not _model_available(str(MODEL_PATH)):
         st.error("❌ **Model file not found!**")
         st.info(f"Please ensure the GGUF model file is located at: `{MODEL_PATH}`")
         st.stop()
@@ -755,12 +957,7 @@ def main():
         st.subheader("👥 Debate Participants")
         for key, personality in AGENT_PERSONALITIES.items():
             if key != "moderator":
-                emoji = {
-                    "optimist": "😊", 
-                    "skeptic": "🤔", 
-                    "ethicist": "⚖️", 
-                    "judge": "👩‍⚖️"
-                }.get(key, "🤖")
+                emoji = _SIDEBAR_EMOJI.get(key, "🤖")
                 st.write(f"{emoji} **{personality['name']}**")
         
         st.divider()
@@ -804,7 +1001,12 @@ def main():
         # Initialize debate
         with st.spinner("🤖 Initializing debate system..."):
             try:
-                debate_manager = DebateManager(topic=topic, enable_moderator=True)
+                load_llm()
+                debate_manager = DebateManager(
+                    topic=topic,
+                    enable_moderator=True,
+                    display=StreamlitDisplayAdapter()
+                )
                 st.success("✅ Debate system ready!")
             except Exception as e:
                 st.error(f"❌ Error initializing debate: {e}")
@@ -815,15 +1017,23 @@ def main():
         st.info("🚀 Starting debate... Use the stop button below to interrupt at any time.")
         conversation_history = run_debate_display(debate_manager, topic)
         
+        # Built once and shared by the saved history entry and the summary panel
+        summary = debate_manager.get_debate_summary() if hasattr(debate_manager, 'get_debate_summary') else {}
+        
         # Save to history (even if stopped early)
         if conversation_history and len(conversation_history) > 1:  # More than just system message
             st.session_state.debate_history.append({
                 "topic": topic,
                 "timestamp": datetime.now().isoformat(),
-                "conversation": conversation_history,
-                "summary": debate_manager.get_debate_summary() if hasattr(debate_manager, 'get_debate_summary') else {},
+                "conversation": [
+                    dict(m, timestamp=datetime.fromtimestamp(m["timestamp"]).isoformat())
+                    for m in conversation_history
+                ],
+                "summary": summary,
                 "stopped_early": st.session_state.stop_debate
             })
+            # Keep session memory bounded on long-running servers
+            st.session_state.debate_history = st.session_state.debate_history[-MAX_DEBATE_HISTORY:]
         
         # Show completion message
         if st.session_state.stop_debate:
@@ -832,95 +1042,9 @@ def main():
             st.success("🎉 Debate completed!")
         
         # Show comprehensive summary in dropdown format
-        if hasattr(debate_manager, 'get_debate_summary') and len(conversation_history) > 1:
-            summary = debate_manager.get_debate_summary()
-            
-            # Main summary dropdown
-            with st.expander("📊 **Debate Summary & Statistics**", expanded=False):
-                st.markdown("### 📈 Quick Overview")
-                
-                # Basic metrics in a compact layout
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("💬 Messages", summary.get('total_messages', len(conversation_history)))
-                with col2:
-                    st.metric("🔄 Exchanges", summary.get('total_exchanges', len([m for m in conversation_history if m['name'] != 'System'])))
-                with col3:
-                    st.metric("👥 Participants", len(summary.get('participants', [])))
-                with col4:
-                    st.metric("🎯 Status", "✅ Complete" if len(conversation_history) > 2 else "⚠️ Partial")
-                
-                st.divider()
-                
-                # Detailed summaries section
-                detailed_summary = summary.get('detailed_summary', {})
-                if detailed_summary and detailed_summary != "No detailed summaries available yet.":
-                    st.markdown("### 📝 Exchange Summaries")
-                    
-                    # Parse detailed summary if it's a string
-                    if isinstance(detailed_summary, str):
-                        # Split by exchange if formatted as combined string
-                        exchange_parts = detailed_summary.split("Exchange ")
-                        for i, part in enumerate(exchange_parts[1:], 1):  # Skip first empty part
-                            if part.strip():
-                                lines = part.strip().split('\n', 1)
-                                if len(lines) > 1:
-                                    exchange_title = f"Exchange {lines[0].split(':')[0]}"
-                                    exchange_content = lines[1].strip()
-                                    st.markdown(f"**🔍 {exchange_title}:**")
-                                    st.write(exchange_content)
-                                    st.markdown("---")
-                    else:
-                        # Handle dictionary format
-                        for exchange_num in sorted(detailed_summary.keys()):
-                            exchange_summary = detailed_summary[exchange_num]
-                            if isinstance(exchange_summary, dict) and 'summary' in exchange_summary:
-                                content = exchange_summary['summary']
-                            elif isinstance(exchange_summary, str):
-                                content = exchange_summary
-                            else:
-                                content = str(exchange_summary)
-                            
-                            if content and content.strip():
-                                st.markdown(f"**🔍 Exchange {exchange_num}:**")
-                                st.write(content)
-                                st.markdown("---")
-                
-                st.divider()
-                
-                # Summary statistics section
-                summary_stats = summary.get('summary_stats', {})
-                if summary_stats:
-                    st.markdown("### 📊 Detailed Statistics")
-                    
-                    stats_col1, stats_col2, stats_col3 = st.columns(3)
-                    
-                    with stats_col1:
-                        if 'brief_summaries' in summary_stats:
-                            st.metric("📋 Brief Summaries", summary_stats['brief_summaries'])
-                        if 'total_words' in summary_stats:
-                            st.metric("📝 Total Words", summary_stats['total_words'])
-                    
-                    with stats_col2:
-                        if 'detailed_summaries' in summary_stats:
-                            st.metric("📄 Detailed Summaries", summary_stats['detailed_summaries'])
-                        if 'avg_summary_length' in summary_stats:
-                            st.metric("📏 Avg Summary Length", f"{summary_stats['avg_summary_length']} words")
-                    
-                    with stats_col3:
-                        if 'exchanges_covered' in summary_stats:
-                            st.metric("🔄 Exchanges Covered", summary_stats['exchanges_covered'])
-                        # Add participants list
-                        participants = summary.get('participants', [])
-                        if participants:
-                            st.metric("👥 Participant Count", len(participants))
-                    
-                    # Show participant list
-                    participants = summary.get('participants', [])
-                    if participants:
-                        st.markdown("**🎭 Participants:**")
-                        participant_text = " • ".join(participants)
-                        st.write(participant_text)
+        if summary and len(conversation_history) > 1:
+            exchange_summaries = _normalize_detailed_summary(summary.get('detailed_summary'))
+            _render_summary(summary, conversation_history, exchange_summaries)
         
         # Reset states
         st.session_state.debate_running = False
@@ -931,20 +1055,7 @@ def main():
             st.rerun()
     
     # Show debate history
-    if st.session_state.debate_history:
-        st.header("📚 Recent Debates")
-        
-        for i, debate in enumerate(reversed(st.session_state.debate_history[-3:])):  # Show last 3
-            with st.expander(f"🎭 {debate['topic']} - {debate['timestamp'][:19]}"):
-                st.write(f"**Messages:** {len(debate['conversation'])}")
-                
-                # Show conversation
-                for msg in debate['conversation']:
-                    if msg['name'] == 'System':
-                        st.info(f"**System:** {msg['content']}")
-                    else:
-                        avatar = get_agent_avatar(msg['name'])
-                        st.write(f"{avatar} **{msg['name']}:** {msg['content']}")
+    _render_history()
 
 if __name__ == "__main__":
     main()
@@ -1,37 +1,78 @@
 """Debate manager for orchestrating group chat debates."""
-import time
-from typing import List, Dict, Optional
+import functools
+from collections import deque
+from itertools import islice
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional
 import logging
 from .agents import DebateAgentFactory, LocalLLMAgent
 from .config import (
     DEBATE_CONFIG, COLORS,
     get_initial_debate_message, get_starter_context_prompt, get_starter_selection_prompt,
     get_final_evaluation_prompt, get_clarification_prompt, get_agent_context_instructions,
-    get_moderator_intervention_instructions
+    get_agent_response_cue, get_moderator_intervention_instructions
 )
 from .display import DebateDisplay
+from .llm_wrapper import get_llm
 from .summary_manager import SummaryManager
 from .interactive_judge import InteractiveJudge
 
 logger = logging.getLogger(__name__)
 
+# Name keywords for the numbered options in the starter selection prompt
+_STARTER_ROLES = ("Optimist", "Skeptic", "Ethics")
+
+@functools.lru_cache(maxsize=256)
+def _pick_starter_choice(topic: str) -> int:
+    """Ask the model which personality should open a debate on a topic.
+    
+    The selection prompt depends only on the topic, so repeat topics reuse the
+    earlier answer instead of another model call. Failures raise, so they are
+    not cached.
+    
+    Args:
+        topic: The debate topic
+        
+    Returns:
+        The chosen option from the selection prompt (1-3), 1 if unclear
+        
+    Raises:
+        RuntimeError: If the model failed to generate a reply
+    """
+    response = get_llm().generate_response(get_starter_selection_prompt(topic), max_tokens=10)
+    if response.startswith("Error:"):  # generate_response reports failures in-band
+        raise RuntimeError(response)
+    for choice in range(1, len(_STARTER_ROLES) + 1):
+        if str(choice) in response:
+            return choice
+    return 1
+
 class DebateManager:
     """Manages the debate flow and group chat."""
     
-    def __init__(self, topic: str, enable_moderator: bool = True):
+    def __init__(self, topic: str, enable_moderator: bool = True, display=None):
         """Initialize the debate manager.
         
         Args:
             topic: The debate topic
             enable_moderator: Whether to include a moderator
+            display: Display backend to render the debate with; defaults to the console
         """
         self.topic = topic
         self.enable_moderator = enable_moderator
         self.agents = {}
         self.moderator = None
         self.judge = None
-        self.display = DebateDisplay()
+        self.display = display or DebateDisplay()
         self.conversation_history = []
+        self._speaker_idx = 0  # Position of the current speaker in the rotation
+        self._recent = deque(maxlen=6)  # Tail of conversation_history for context building
+        self._recent_lens = deque(maxlen=3)  # Content lengths of the last three messages
+        self._recent_len_sum = 0  # Running total of _recent_lens
+        self._exchange_count = 0  # Debater turns only; system, moderator and clarification messages excluded
+        self._latest_exchange = 1  # Highest exchange number among non-system messages
+        self._participant_msg_count = 0  # Non-system messages in conversation_history
+        self._summary_cache = None  # (history length, summary) from the last get_debate_summary
         
         # Initialize new components
         self.summary_manager = SummaryManager()
@@ -45,6 +86,12 @@ class DebateManager:
         
         # Create debate agents
         self.agents = DebateAgentFactory.create_all_agents()
+        self._role_index = {
+            keyword: agent
+            for agent in self.agents.values()
+            for keyword in _STARTER_ROLES
+            if keyword in agent.name
+        }
         
         # Create judge
         self.judge = DebateAgentFactory.create_judge()
@@ -56,6 +103,9 @@ class DebateManager:
         if self.enable_moderator:
             self.moderator = DebateAgentFactory.create_moderator()
         
+        # Participant names don't change after setup
+        self._participants = tuple(agent.name for agent in self.agents.values())
+        
         logger.info(f"Created {len(self.agents)} debate agents, 1 interactive judge" +
                    (f" and 1 moderator" if self.moderator else ""))
     
@@ -100,7 +150,7 @@ class DebateManager:
         """
         # Show initial message
         self.display.show_message("System", initial_message, "white")
-        self.conversation_history.append({
+        self._record_message({
             "name": "System",
             "content": initial_message
         })
@@ -110,6 +160,7 @@ class DebateManager:
         
         # Select the best starting agent
         current_speaker = self._select_best_starter(debate_agents)
+        self._speaker_idx = debate_agents.index(current_speaker)
         self.display.show_message("System", f"{current_speaker.name} will start the discussion.", "white")
         
         # Track conversation metrics
@@ -143,13 +194,14 @@ class DebateManager:
                         self.display.show_message("System", "Debate stopped by user request.", "white")
                         break
                     
-                    self.conversation_history.append({
+                    self._record_message({
                         "name": current_speaker.name,
                         "content": response,
                         "exchange": current_exchange
                     })
                     
                     total_exchanges += 1
+                    self._exchange_count = total_exchanges
                     
                     # Generate brief summary for this response
                     self.summary_manager.update_brief_summary(current_speaker.name, response, current_exchange)
@@ -161,9 +213,6 @@ class DebateManager:
                     # Check if judge intervention is needed
                     self._check_judge_intervention(current_speaker, response, total_exchanges)
                     
-                    # Brief pause between speakers
-                    time.sleep(1)
-                    
                     # Select next speaker naturally based on conversation flow
                     current_speaker = self._select_next_speaker(debate_agents, current_speaker)
                     
@@ -192,6 +241,24 @@ class DebateManager:
         # Final evaluation and summary
         self._provide_final_evaluation()
     
+    def _record_message(self, message: Dict):
+        """Append a message to the conversation history and update the running aggregates.
+        
+        Args:
+            message: Message dict with at least name and content
+        """
+        self.conversation_history.append(message)
+        self._recent.append(message)
+        self._summary_cache = None
+        length = len(message["content"])
+        if len(self._recent_lens) == self._recent_lens.maxlen:
+            self._recent_len_sum -= self._recent_lens[0]
+        self._recent_lens.append(length)
+        self._recent_len_sum += length
+        if message["name"] != "System":
+            self._participant_msg_count += 1
+            self._latest_exchange = max(self._latest_exchange, message.get("exchange", 1))
+    
     def _select_next_speaker(self, agents: List[LocalLLMAgent], current_speaker: LocalLLMAgent) -> LocalLLMAgent:
         """Select the next speaker based on natural conversation flow.
         
@@ -203,9 +270,8 @@ class DebateManager:
             Next speaker agent
         """
         # Simple rotation for now - can be enhanced with more intelligent selection
-        current_index = agents.index(current_speaker)
-        next_index = (current_index + 1) % len(agents)
-        return agents[next_index]
+        self._speaker_idx = (self._speaker_idx + 1) % len(agents)
+        return agents[self._speaker_idx]
     
     def _provide_final_evaluation(self):
         """Provide final evaluation and summary of the conversation."""
@@ -219,7 +285,7 @@ class DebateManager:
         # Get final detailed summary
         if self.summary_manager:
             final_summary = self.summary_manager.get_detailed_summary()
-            if final_summary and final_summary != "No detailed summaries available yet.":
+            if final_summary:
                 self.display.show_message("System", "\n📋 CONVERSATION SUMMARY:", "white")
                 self.display.show_message("System", final_summary, "white")
             
@@ -230,17 +296,11 @@ class DebateManager:
         # Judge's final evaluation if available
         if self.judge:
             try:
-                # Count non-system messages for evaluation
-                participant_messages = [
-                    msg for msg in self.conversation_history
-                    if msg.get("name") != "System"
-                ]
-                
-                if participant_messages:
+                if self._participant_msg_count:
                     # Get detailed context from summary manager
                     detailed_context = self.get_summary_for_judge("detailed")
                     evaluation_prompt = get_final_evaluation_prompt(
-                        self.topic, len(participant_messages), detailed_context
+                        self.topic, self._participant_msg_count, detailed_context
                     )
 
                     success, final_evaluation = self.judge._custom_generate_reply(
@@ -263,25 +323,12 @@ class DebateManager:
         Returns:
             The selected starter agent
         """
-        # Ask the model which agent should start
-        starter_prompt = get_starter_selection_prompt(self.topic)
-
         try:
-            from .llm_wrapper import get_llm
-            llm = get_llm()
-            response = llm.generate_response(starter_prompt, max_tokens=10)
+            choice = _pick_starter_choice(self.topic)
+            
+            # Map the prompt's numbered option onto the agent, falling back to the first one
+            selected = self._role_index.get(_STARTER_ROLES[choice - 1], agents[0])
             
-            # Parse the response to get the agent
-            if "1" in response:
-                selected = next(agent for agent in agents if "Optimist" in agent.name)
-            elif "2" in response:
-                selected = next(agent for agent in agents if "Skeptic" in agent.name)
-            elif "3" in response:
-                selected = next(agent for agent in agents if "Ethics" in agent.name)
-            else:
-                # Default to optimist if unclear
-                selected = next(agent for agent in agents if "Optimist" in agent.name)
-                
             logger.info(f"Selected {selected.name} to start the debate")
             return selected
             
@@ -308,10 +355,16 @@ class DebateManager:
             else:
                 context_message = self._prepare_context_for_agent(agent)
             
+            # Stream raw tokens to displays that can render them live
+            on_token = None
+            if hasattr(self.display, 'show_token'):
+                on_token = lambda token: self.display.show_token(agent.name, token)
+            
             # Get response using the agent's custom reply method
             success, response = agent._custom_generate_reply(
                 messages=[{"content": context_message, "name": "System"}],
-                sender=None
+                sender=None,
+                on_token=on_token
             )
             
             if success and response:
@@ -343,16 +396,14 @@ class DebateManager:
         Returns:
             Context message with concise summary instead of full conversation
         """
-        context_parts = [f"Topic: {self.topic}"]
+        # Static topic and instructions first so successive turns share a prompt
+        # prefix the llama.cpp prompt cache can reuse; per-turn summary goes last
+        context_parts = [f"Topic: {self.topic}", get_agent_context_instructions()]
         
         # Always use summary context instead of full conversation history
         if len(self.conversation_history) > 1:  # If there's any conversation to summarize
             try:
-                current_exchange_round = max(
-                    (msg.get("exchange", 1) for msg in self.conversation_history
-                     if msg.get("name") != "System"),
-                    default=1
-                )
+                current_exchange_round = self._latest_exchange
                 
                 # Get concise summary context
                 summary_context = self.summary_manager.get_context_for_judge("quick", current_exchange_round, self.conversation_history)
@@ -367,7 +418,7 @@ class DebateManager:
                 # Fallback to brief summary
                 context_parts.append(self._generate_brief_context_summary(agent))
         
-        context_parts.append(get_agent_context_instructions())
+        context_parts.append(get_agent_response_cue())
         return "\n".join(context_parts)
     
     def _generate_brief_context_summary(self, agent: LocalLLMAgent) -> str:
@@ -379,24 +430,26 @@ class DebateManager:
         Returns:
             Brief context summary
         """
-        # Get recent non-system messages from other participants
-        other_messages = [
-            msg for msg in self.conversation_history[-6:]
-            if msg.get("name") != agent.name and msg.get("name") != "System"
-        ]
+        # Walk the recent window backwards, stopping at the last 3 messages from others
+        other_messages = []
+        for msg in reversed(self._recent):
+            if msg.get("name") != agent.name and msg.get("name") != "System":
+                other_messages.append(msg)
+                if len(other_messages) == 3:
+                    break
         
         if not other_messages:
             return "\nNo previous discussion to summarize."
         
         # Create brief summary of key points
         summary_parts = ["\nKey points from discussion:"]
-        for msg in other_messages[-3:]:  # Only last 3 messages from others
+        for msg in reversed(other_messages):
             # Truncate long messages to key points
             content = msg['content']
             if len(content) > 150:
                 # Try to get the first sentence or key point
-                sentences = content.split('. ')
-                content = sentences[0] + '.' if sentences else content[:150] + "..."
+                end = content.find('. ')
+                content = content[:end + 1] if end != -1 else content[:150] + "..."
             summary_parts.append(f"- {msg['name']}: {content}")
         
         return "\n".join(summary_parts)
@@ -423,7 +476,7 @@ class DebateManager:
             
             if success and response:
                 self.display.show_message(self.moderator.name, response, self.moderator.personality["color"])
-                self.conversation_history.append({
+                self._record_message({
                     "name": self.moderator.name,
                     "content": response
                 })
@@ -440,39 +493,31 @@ class DebateManager:
         Returns:
             Moderator context message
         """
+        # Static prefix first (see _prepare_context_for_agent), then per-call content
         context_parts = [
             f"Topic: {self.topic}",
-            f"After {exchange_num} exchanges - Time for moderator intervention.",
+            get_moderator_intervention_instructions(),
+            f"\nAfter {exchange_num} exchanges - Time for moderator intervention.",
         ]
         
         # Use summary manager to get appropriate context
         try:
-            current_exchange_round = max(
-                (msg.get("exchange", 1) for msg in self.conversation_history
-                 if msg.get("name") != "System"),
-                default=1
-            )
-            
-            summary_context = self.summary_manager.get_context_for_judge("quick", current_exchange_round, self.conversation_history)
-            if summary_context and summary_context != "No context available.":
-                context_parts.append(f"\nDiscussion summary:\n{summary_context}")
-            else:
-                # Fallback to recent messages if no summary available
-                recent_messages = self.conversation_history[-5:] if len(self.conversation_history) > 5 else self.conversation_history
-                context_parts.append("\nRecent discussion:")
-                for msg in recent_messages:
-                    if msg["name"] != "System" and msg["name"] != self.moderator.name:
-                        context_parts.append(f"- {msg['name']}: {msg['content'][:100]}...")
+            summary_context = self.summary_manager.get_context_for_judge("quick", self._latest_exchange, self.conversation_history)
         except Exception as e:
             logger.error(f"Error getting summary context for moderator: {e}")
-            # Fallback to recent messages
-            recent_messages = self.conversation_history[-5:] if len(self.conversation_history) > 5 else self.conversation_history
-            context_parts.append("\nRecent discussion:")
-            for msg in recent_messages:
-                if msg["name"] != "System" and msg["name"] != self.moderator.name:
-                    context_parts.append(f"- {msg['name']}: {msg['content'][:100]}...")
+            summary_context = None
         
-        context_parts.append(f"\n{get_moderator_intervention_instructions()}")
+        if summary_context and summary_context != "No context available.":
+            context_parts.append(f"\nDiscussion summary:\n{summary_context}")
+        else:
+            # Fallback to recent messages if no summary available
+            skip_names = ("System", self.moderator.name)
+            context_parts.append("\nRecent discussion:")
+            context_parts.extend(
+                f"- {msg['name']}: {msg['content'][:100]}..."
+                for msg in islice(self._recent, max(len(self._recent) - 5, 0), None)
+                if msg["name"] not in skip_names
+            )
         
         return "\n".join(context_parts)
     
@@ -483,14 +528,11 @@ class DebateManager:
             True if debate should end, False otherwise
         """
         # Simple heuristic: end if recent messages are very short or repetitive
-        if len(self.conversation_history) < 3:
+        if len(self._recent_lens) < self._recent_lens.maxlen:
             return False
         
-        recent_messages = self.conversation_history[-3:]
-        avg_length = sum(len(msg["content"]) for msg in recent_messages) / len(recent_messages)
-        
         # End if average message length is very short (indicates low engagement)
-        return avg_length < 50
+        return self._recent_len_sum < 50 * self._recent_lens.maxlen
     
     def _check_judge_intervention(self, speaker: LocalLLMAgent, response: str, exchange_num: int):
         """Check if judge intervention is needed and handle it.
@@ -504,17 +546,12 @@ class DebateManager:
             return
             
         try:
-            # Analyze argument quality
-            needs_clarification, weakness_type, confidence = self.interactive_judge.analyze_argument_quality(
-                speaker.name, response, exchange_num
+            # Analyze argument quality and draft the clarifying question in one pass
+            needs_clarification, weakness_type, confidence, question = self.interactive_judge.analyze_and_question(
+                speaker.name, response, exchange_num, min_confidence=0.6
             )
             
-            if needs_clarification and confidence > 0.6:
-                # Generate clarifying question
-                question = self.interactive_judge.generate_clarifying_question(
-                    speaker.name, response, weakness_type, exchange_num
-                )
-                
+            if needs_clarification and question:
                 # Display judge's question
                 self.display.show_message("Judge Sophia", f"🤔 {question}", "blue")
                 
@@ -532,10 +569,11 @@ class DebateManager:
                         self.display.show_message(speaker.name, f"📝 {clarification}", speaker.personality["color"])
                         
                         # Add clarification to conversation history
-                        self.conversation_history.append({
+                        self._record_message({
                             "name": speaker.name,
-                            "content": f"[Clarification] {clarification}",
-                            "exchange": exchange_num
+                            "content": clarification,
+                            "exchange": exchange_num,
+                            "is_clarification": True
                         })
                         
                         # Evaluate the clarification
@@ -560,35 +598,41 @@ class DebateManager:
         Returns:
             Debate summary dictionary with detailed summaries
         """
+        # Reuse the last summary while no new messages have been recorded
+        if self._summary_cache and self._summary_cache[0] == len(self.conversation_history):
+            return self._summary_cache[1]
+        
         # Update summaries to ensure they're current
         self.summary_manager.update_summaries(self.conversation_history)
         
-        return {
+        summary = {
             "topic": self.topic,
-            "total_exchanges": len(self.conversation_history),
+            "total_exchanges": self._exchange_count,
             "total_messages": len(self.conversation_history),
-            "participants": [agent.name for agent in self.agents.values()],
+            "participants": list(self._participants),
             "moderator_used": self.moderator is not None,
             "conversation_history": self.conversation_history,
             "detailed_summary": self.summary_manager.get_detailed_summary(),
             "summary_stats": self.summary_manager.get_summary_stats()
         }
+        self._summary_cache = (len(self.conversation_history), summary)
+        return summary
     
-    def get_brief_summaries(self) -> Dict:
+    def get_brief_summaries(self) -> Mapping:
         """Get brief summaries for all exchanges.
         
         Returns:
-            Dictionary of brief summaries by exchange and speaker
+            Read-only view of brief summaries by exchange and speaker
         """
-        return self.summary_manager.brief_summaries
+        return MappingProxyType(self.summary_manager.brief_summaries)
     
-    def get_detailed_summaries(self) -> Dict:
+    def get_detailed_summaries(self) -> Mapping:
         """Get detailed summaries for all exchanges.
         
         Returns:
-            Dictionary of detailed summaries by exchange number
+            Read-only view of detailed summaries by exchange number
         """
-        return self.summary_manager.detailed_summaries
+        return MappingProxyType(self.summary_manager.detailed_summaries)
     
     def get_summary_for_judge(self, decision_type: str = "detailed") -> str:
         """Get appropriate summary context for judge decisions.
@@ -603,11 +647,7 @@ class DebateManager:
             return "No conversation history available."
         
         # Find the latest exchange number
-        latest_exchange = max(
-            (msg.get("exchange", 1) for msg in self.conversation_history
-             if msg.get("name") != "System"),
-            default=1
-        )
+        latest_exchange = self._latest_exchange
         
         return self.summary_manager.get_context_for_judge(
             decision_type, latest_exchange, self.conversation_history
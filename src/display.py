@@ -1,11 +1,90 @@
 """Display utilities for formatting debate output in the CLI."""
 
+import functools
+import shutil
+import sys
+import textwrap
+import threading
 import time
 import os
+import re
 from typing import List
 from .config import COLORS, AGENT_PERSONALITIES
 import streamlit as st
 
+# Per-character delay multipliers for _stream_text, indexed by ord(char);
+# non-ASCII characters use the base delay
+_STREAM_DELAY_SCALE = [1.0] * 128
+for _char in '.!?':
+    _STREAM_DELAY_SCALE[ord(_char)] = 3.0  # Longer pause after sentences
+for _char in ',;:':
+    _STREAM_DELAY_SCALE[ord(_char)] = 2.0  # Medium pause after punctuation
+_STREAM_DELAY_SCALE[ord(' ')] = 0.5  # Short pause after spaces
+del _char
+
+# Splits streamed text into runs, keeping the character each run ends on
+_STREAM_SPLIT_RE = re.compile(r"([.!?,;: ])")
+
+# Text _fast_wrap can handle itself: hyphen-free words separated by single spaces
+_PLAIN_TEXT_RE = re.compile(r"[^\s-]+(?: [^\s-]+)*")
+
+def _fast_wrap(text: str, width: int) -> List[str]:
+    """Greedily wrap plain text on spaces in a single forward pass.
+    
+    Only handles words separated by single spaces. Anything else falls
+    back to textwrap, which handles those cases differently: tabs,
+    newlines and other whitespace, repeated or leading/trailing spaces,
+    hyphenated words (textwrap may break after the hyphen) and words
+    longer than a line.
+    
+    Args:
+        text: Text to wrap
+        width: Maximum line width
+        
+    Returns:
+        List of wrapped lines
+    """
+    if not _PLAIN_TEXT_RE.fullmatch(text):
+        return textwrap.wrap(text, width=width)
+    
+    lines = []
+    line = []
+    line_len = 0
+    for word in text.split():
+        word_len = len(word)
+        if word_len > width:
+            return textwrap.wrap(text, width=width)
+        if line and line_len + 1 + word_len > width:
+            lines.append(" ".join(line))
+            line = [word]
+            line_len = word_len
+        else:
+            line_len += word_len + 1 if line else word_len
+            line.append(word)
+    
+    if line:
+        lines.append(" ".join(line))
+    return lines
+
+@functools.lru_cache(maxsize=512)
+def _wrap_cached(text: str, width: int, indent: int) -> str:
+    """Wrap and indent text, memoized for repeated banner/system strings.
+    
+    Args:
+        text: Text to wrap
+        width: Available line width, excluding indentation
+        indent: Number of spaces to indent
+        
+    Returns:
+        Wrapped text
+    """
+    # Wrap the text
+    wrapped_lines = _fast_wrap(text, width)
+    
+    # Add indentation
+    indent_str = " " * indent
+    return "\n".join(indent_str + line for line in wrapped_lines)
+
 class DebateDisplay:
     """Handles the visual presentation of the debate in the CLI."""
     
@@ -13,10 +92,14 @@ class DebateDisplay:
         """Initialize the display manager."""
         self.terminal_width = 80  # Default terminal width
         try:
-            import shutil
             self.terminal_width = shutil.get_terminal_size().columns
         except:
             pass  # Use default if unable to get terminal size
+        
+        # Resolved once; used by every separator, centering and wrap call
+        self._width = min(self.terminal_width, 80)
+        self._white = COLORS["white"]
+        self._speaker_line_parts = {}
     
     def show_debate_header(self, topic: str, participants: List[str]):
         """Display the debate header with topic and participants.
@@ -36,7 +119,7 @@ class DebateDisplay:
         for participant in participants:
             personality = self._get_personality_by_participant(participant)
             if personality:
-                color = COLORS.get(personality["color"], COLORS["white"])
+                color = COLORS.get(personality["color"], self._white)
                 print(f"  {color}• {personality['name']}{COLORS['reset']} - {self._get_personality_description(participant)}")
         
         if len(participants) < len(AGENT_PERSONALITIES) - 1:  # -1 for moderator
@@ -64,15 +147,18 @@ class DebateDisplay:
             color_key: Color key for the speaker
             streaming: Whether to display with streaming effect
         """
-        color = COLORS.get(color_key, COLORS["white"])
-        timestamp = time.strftime("%H:%M:%S")
-        speaker_line = f"[{timestamp}] {speaker}:"
+        color = COLORS.get(color_key, self._white)
         if os.environ.get("DEBATELAB_STREAMLIT") == "1":
             st.markdown(f"**{speaker}**: {message}")
         else:
-            # Format the speaker name with color and timestamp
-            speaker_line = f"{COLORS['bold']}{color}[{timestamp}] {speaker}:{COLORS['reset']}"
-            print(speaker_line)
+            # Format the speaker name with color and timestamp; only the
+            # timestamp changes between messages from the same speaker
+            key = (speaker, color)
+            parts = self._speaker_line_parts.get(key)
+            if parts is None:
+                parts = (f"{COLORS['bold']}{color}[", f"] {speaker}:{COLORS['reset']}")
+                self._speaker_line_parts[key] = parts
+            print(parts[0] + time.strftime("%H:%M:%S") + parts[1])
             
             if streaming:
                 self._stream_text(message, color, indent=2)
@@ -92,26 +178,60 @@ class DebateDisplay:
             indent: Number of spaces to indent
             delay: Delay between characters (seconds)
         """
-        import sys
-        
-        # Add indentation
-        indent_str = " " * indent
-        print(indent_str, end="")
-        
-        # Stream the text character by character
-        print(color, end="")
-        for char in text:
-            print(char, end="", flush=True)
-            if char in '.!?':
-                time.sleep(delay * 3)  # Longer pause after sentences
-            elif char in ',;:':
-                time.sleep(delay * 2)  # Medium pause after punctuation
-            elif char == ' ':
-                time.sleep(delay * 0.5)  # Short pause after spaces
-            else:
-                time.sleep(delay)  # Normal character delay
+        stdout = sys.stdout
+        if not stdout.isatty():
+            # Nobody watches piped or captured output stream in, so skip the
+            # pacing and let normal buffering batch the write
+            stdout.write(" " * indent + color + text + COLORS['reset'])
+            return
+        
+        stdout.write(" " * indent + color)
+        stdout.flush()
+        emit = self._chunk_writer(stdout)
         
-        print(COLORS['reset'], end="")
+        # Write word/punctuation-sized runs and sleep for each run's accumulated
+        # delay; split() yields [run, break, run, break, ..., last run]
+        parts = _STREAM_SPLIT_RE.split(text)
+        for i in range(0, len(parts) - 1, 2):
+            chunk, sep = parts[i], parts[i + 1]
+            emit(chunk + sep)
+            time.sleep(delay * (len(chunk) + _STREAM_DELAY_SCALE[ord(sep)]))
+        
+        if parts[-1]:
+            emit(parts[-1])
+            time.sleep(delay * len(parts[-1]))
+        
+        stdout.write(COLORS['reset'])
+    
+    def _chunk_writer(self, stream):
+        """Get a function that writes one streamed chunk straight to the terminal.
+        
+        When the stream is backed by a real file descriptor, chunks are encoded
+        and written with os.write, skipping the text and buffer layers and the
+        per-chunk flush. Streams without one (captured output, StringIO) fall
+        back to write + flush. The stream must be flushed before the first chunk.
+        
+        Args:
+            stream: Text stream the chunks belong to
+            
+        Returns:
+            Callable taking a text chunk
+        """
+        try:
+            fd = stream.fileno()
+        except (AttributeError, OSError, ValueError):  # io.UnsupportedOperation
+            def emit(chunk: str):
+                stream.write(chunk)
+                stream.flush()
+            return emit
+        
+        encoding = getattr(stream, "encoding", None) or "utf-8"
+        
+        def emit(chunk: str):
+            data = chunk.encode(encoding, errors="replace")
+            while data:
+                data = data[os.write(fd, data):]
+        return emit
     
     def show_debate_footer(self, total_rounds: int):
         """Display the debate conclusion.
@@ -158,7 +278,7 @@ class DebateDisplay:
         Args:
             char: Character to use for the separator
         """
-        print(char * min(self.terminal_width, 80))
+        print(char * self._width)
     
     def _print_centered(self, text: str, color_key: str = "white"):
         """Print centered text.
@@ -167,8 +287,8 @@ class DebateDisplay:
             text: Text to center
             color_key: Color key for the text
         """
-        color = COLORS.get(color_key, COLORS["white"])
-        padding = (min(self.terminal_width, 80) - len(text)) // 2
+        color = COLORS.get(color_key, self._white)
+        padding = (self._width - len(text)) // 2
         centered_text = " " * padding + text
         print(f"{color}{centered_text}{COLORS['reset']}")
     
@@ -182,17 +302,7 @@ class DebateDisplay:
         Returns:
             Wrapped text
         """
-        import textwrap
-        
-        # Calculate available width
-        available_width = min(self.terminal_width, 80) - indent
-        
-        # Wrap the text
-        wrapped_lines = textwrap.wrap(text, width=available_width)
-        
-        # Add indentation
-        indent_str = " " * indent
-        return "\n".join(indent_str + line for line in wrapped_lines)
+        return _wrap_cached(text, self._width - indent, indent)
     
     def _get_personality_by_participant(self, participant_key: str) -> dict:
         """Get personality config by participant key.
@@ -236,20 +346,23 @@ class ProgressIndicator:
     
     def start(self):
         """Start the progress indicator."""
-        import threading
-        import sys
-        
         self.is_running = True
         
+        # Every frame only depends on the message, so render them up front
+        chars = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+        self._frames = [f"\r{COLORS['cyan']}{c} {self.message}...{COLORS['reset']}" for c in chars]
+        self._clear = "\r" + " " * (len(self.message) + 10) + "\r"
+        
         def animate():
-            chars = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+            frames = self._frames
+            write = sys.stdout.write
             i = 0
             while self.is_running:
-                sys.stdout.write(f"\r{COLORS['cyan']}{chars[i]} {self.message}...{COLORS['reset']}")
+                write(frames[i])
                 sys.stdout.flush()
                 time.sleep(0.1)
-                i = (i + 1) % len(chars)
-            sys.stdout.write("\r" + " " * (len(self.message) + 10) + "\r")
+                i = (i + 1) % len(frames)
+            write(self._clear)
             sys.stdout.flush()
         
         self.thread = threading.Thread(target=animate)
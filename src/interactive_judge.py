@@ -1,12 +1,79 @@
 """Interactive judge system for real-time debate evaluation and intervention."""
 
+import hashlib
 import logging
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 from .llm_wrapper import get_llm
 from .summary_manager import SummaryManager
 
 logger = logging.getLogger(__name__)
 
+# Weak argument patterns for quick detection. Single words are matched
+# against the argument's word set; multi-word phrases by substring.
+WEAK_PATTERNS_MISSING_EVIDENCE = frozenset({"obviously", "clearly", "undeniably", "certainly"})
+WEAK_PHRASES_MISSING_EVIDENCE = ("everyone knows", "it's common sense", "without a doubt")
+WEAK_PATTERNS_LOGICAL_GAPS = frozenset({"therefore", "thus", "so", "hence", "consequently"})
+WEAK_PATTERNS_VAGUE_LANGUAGE = frozenset({"probably", "might", "perhaps", "maybe"})
+WEAK_PHRASES_VAGUE_LANGUAGE = ("some people", "many believe", "it seems", "could be")
+WEAK_PATTERNS_WEAK_CONNECTIONS = frozenset({"anyway", "regardless"})
+WEAK_PHRASES_WEAK_CONNECTIONS = ("moving on", "in any case")
+
+# Arguments with fewer words than this are flagged as lacking detail
+MIN_ARGUMENT_WORDS = 20
+
+# Recent judge replies kept for identical prompts (retries, re-evaluations)
+JUDGE_CACHE_SIZE = 256
+
+_JUSTIFICATION_WORDS = frozenset({"because", "since"})
+_DEBATER_NAMES = frozenset({"alex", "sam", "elena"})
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Labeled lines in the judge's analysis and clarification-evaluation replies;
+# only [ \t] follows the colon so an empty field can't capture the next line
+_QUALITY_RE = re.compile(
+    r"^(NEEDS_CLARIFICATION|WEAKNESS_TYPE|CONFIDENCE|BRIEF_REASON|QUESTION):[ \t]*(.*)$", re.MULTILINE
+)
+_EVAL_RE = re.compile(r"^(ADEQUATE|ASSESSMENT):[ \t]*(.*)$", re.MULTILINE)
+
+def _labeled_fields(pattern: re.Pattern, text: str) -> Dict[str, str]:
+    """Collect the labeled fields of a judge reply.
+    
+    Args:
+        pattern: One of the labeled-line patterns above
+        text: Reply text
+    
+    Returns:
+        Mapping of label to stripped value; later lines win, empty fields are ''
+    """
+    return {m.group(1): m.group(2).strip() for m in pattern.finditer(text.strip())}
+
+def _quality_reply_complete(text: str) -> bool:
+    """Check whether a partial quality-analysis reply has every field we use.
+    
+    Args:
+        text: Reply generated so far; only complete lines are considered
+    
+    Returns:
+        True once the verdict, type and confidence are in, plus the question
+        when clarification is needed
+    """
+    # Parsed exactly like the final reply, so stopping early can't change the result
+    fields = _labeled_fields(_QUALITY_RE, text[:text.rfind("\n")])
+    if not all(key in fields for key in ("NEEDS_CLARIFICATION", "WEAKNESS_TYPE", "CONFIDENCE")):
+        return False
+    return "yes" not in fields["NEEDS_CLARIFICATION"].lower() or "QUESTION" in fields
+
+@dataclass(slots=True, frozen=True)
+class Intervention:
+    """A clarifying question the judge put to a speaker."""
+    exchange: int
+    speaker: str
+    weakness_type: str
+    question: str
+
 class InteractiveJudge:
     """Interactive judge that can analyze arguments and ask clarifying questions."""
     
@@ -21,24 +88,7 @@ class InteractiveJudge:
         self.summary_manager = summary_manager
         self.llm = None
         self.intervention_history = []
-        
-        # Weak argument patterns for quick detection
-        self.weak_patterns = {
-            "missing_evidence": [
-                "obviously", "clearly", "everyone knows", "it's common sense",
-                "without a doubt", "undeniably", "certainly"
-            ],
-            "logical_gaps": [
-                "therefore", "thus", "so", "hence", "consequently"
-            ],
-            "vague_language": [
-                "some people", "many believe", "it seems", "probably",
-                "might", "could be", "perhaps", "maybe"
-            ],
-            "weak_connections": [
-                "anyway", "moving on", "in any case", "regardless"
-            ]
-        }
+        self._response_cache = OrderedDict()
     
     def _get_llm(self):
         """Get LLM instance lazily."""
@@ -46,28 +96,72 @@ class InteractiveJudge:
             self.llm = get_llm()
         return self.llm
     
-    def analyze_argument_quality(self, speaker: str, argument: str, exchange_num: int) -> Tuple[bool, str, float]:
-        """Quickly analyze argument quality to determine if intervention is needed.
+    def _generate_cached(self, prompt: str, **kwargs) -> str:
+        """Generate a judge reply, reusing the reply for a recently seen prompt.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters
+            
+        Returns:
+            Generated response text
+        """
+        key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+        response = self._response_cache.get(key)
+        if response is not None:
+            self._response_cache.move_to_end(key)
+            return response
+        
+        response = self._get_llm().generate_response(prompt, **kwargs)
+        if not response.startswith("Error:"):  # Don't pin a failed generation
+            self._response_cache[key] = response
+            if len(self._response_cache) > JUDGE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return response
+    
+    def analyze_and_question(self, speaker: str, argument: str, exchange_num: int,
+                             min_confidence: float = 0.6) -> Tuple[bool, str, float, str]:
+        """Analyze an argument and, if it warrants intervention, produce the question.
+        
+        When the heuristics are inconclusive the model is asked for the analysis and
+        the clarifying question in one prompt, instead of one call for each.
         
         Args:
             speaker: Name of the speaker
             argument: The argument content
             exchange_num: Current exchange number
+            min_confidence: Confidence above which a question is produced, for both
+                heuristic and model-detected weaknesses
         
         Returns:
-            Tuple of (needs_clarification, weakness_type, confidence_score)
+            Tuple of (needs_clarification, weakness_type, confidence_score, question);
+            question is empty unless clarification is needed above min_confidence
         """
-        # Quick heuristic checks
         weakness_type, confidence = self._quick_weakness_detection(argument, exchange_num)
         
         if confidence > 0.7:  # High confidence in weakness detection
-            return True, weakness_type, confidence
+            if confidence <= min_confidence:
+                return True, weakness_type, confidence, ""
+            question = self.generate_clarifying_question(speaker, argument, weakness_type, exchange_num)
+            return True, weakness_type, confidence, question
+        
+        if confidence <= 0.3:
+            return False, "none", confidence, ""
         
-        # If heuristics are inconclusive, use LLM for deeper analysis
-        if confidence > 0.3:  # Medium confidence, worth checking
-            return self._llm_quality_analysis(speaker, argument, exchange_num)
+        needs_clarification, weakness_type, confidence, question = self._llm_quality_analysis(
+            speaker, argument, exchange_num
+        )
+        if not needs_clarification or confidence <= min_confidence:
+            return needs_clarification, weakness_type, confidence, ""
         
-        return False, "none", confidence
+        if not question:
+            # Model flagged a weakness but didn't phrase a question; ask separately
+            question = self.generate_clarifying_question(speaker, argument, weakness_type, exchange_num)
+        else:
+            question = question.rstrip('?') + '?'
+            self.intervention_history.append(Intervention(exchange_num, speaker, weakness_type, question))
+        
+        return needs_clarification, weakness_type, confidence, question
     
     def _quick_weakness_detection(self, argument: str, exchange_num: int) -> Tuple[str, float]:
         """Use heuristics to quickly detect argument weaknesses.
@@ -78,37 +172,42 @@ class InteractiveJudge:
         Returns:
             Tuple of (weakness_type, confidence_score)
         """
-        argument_lower = argument.lower()
+        # N words need at least 2N-1 characters (one letter each plus separators),
+        # so anything shorter is too short without tokenizing it
+        if len(argument) < 2 * MIN_ARGUMENT_WORDS - 1:
+            return "insufficient_detail", 0.8
+        
         word_count = len(argument.split())
         
         # Check for very short arguments
-        if word_count < 20:
+        if word_count < MIN_ARGUMENT_WORDS:
             return "insufficient_detail", 0.8
         
+        # Tokenize once; the pattern words and name mentions both come from it
+        argument_lower = argument.lower()
+        words = set(_WORD_RE.findall(argument_lower))
+        
         # Check for weak evidence patterns
-        evidence_score = 0
-        for pattern in self.weak_patterns["missing_evidence"]:
-            if pattern in argument_lower:
-                evidence_score += 0.3
+        evidence_hits = len(words & WEAK_PATTERNS_MISSING_EVIDENCE)
+        evidence_hits += sum(1 for phrase in WEAK_PHRASES_MISSING_EVIDENCE if phrase in argument_lower)
+        evidence_score = 0.3 * evidence_hits
         
         if evidence_score > 0.6:
             return "missing_evidence", min(evidence_score, 0.9)
         
         # Check for logical gaps
         logical_score = 0
-        conclusion_words = sum(1 for pattern in self.weak_patterns["logical_gaps"] 
-                              if pattern in argument_lower)
-        if conclusion_words > 2 and "because" not in argument_lower and "since" not in argument_lower:
+        conclusion_words = len(words & WEAK_PATTERNS_LOGICAL_GAPS)
+        if conclusion_words > 2 and not words & _JUSTIFICATION_WORDS:
             logical_score = 0.7
         
         if logical_score > 0.6:
             return "logical_gaps", logical_score
         
         # Check for vague language
-        vague_score = 0
-        for pattern in self.weak_patterns["vague_language"]:
-            if pattern in argument_lower:
-                vague_score += 0.2
+        vague_hits = len(words & WEAK_PATTERNS_VAGUE_LANGUAGE)
+        vague_hits += sum(1 for phrase in WEAK_PHRASES_VAGUE_LANGUAGE if phrase in argument_lower)
+        vague_score = 0.2 * vague_hits
         
         if vague_score > 0.6:
             return "vague_language", min(vague_score, 0.8)
@@ -116,8 +215,7 @@ class InteractiveJudge:
         # Check for poor engagement
         if word_count > 50:  # Only check engagement for longer responses
             engagement_score = 0
-            other_speaker_mentions = argument_lower.count("alex") + argument_lower.count("sam") + argument_lower.count("elena")
-            if other_speaker_mentions == 0 and exchange_num > 1:
+            if words.isdisjoint(_DEBATER_NAMES) and exchange_num > 1:
                 engagement_score = 0.6
             
             if engagement_score > 0.5:
@@ -125,16 +223,20 @@ class InteractiveJudge:
         
         return "none", 0.1
     
-    def _llm_quality_analysis(self, speaker: str, argument: str, exchange_num: int) -> Tuple[bool, str, float]:
+    def _llm_quality_analysis(self, speaker: str, argument: str, exchange_num: int) -> Tuple[bool, str, float, str]:
         """Use LLM for deeper argument quality analysis.
         
+        The same call also drafts a clarifying question, so an intervention
+        doesn't need a second round-trip.
+        
         Args:
             speaker: Name of the speaker
             argument: The argument content
             exchange_num: Current exchange number
         
         Returns:
-            Tuple of (needs_clarification, weakness_type, confidence_score)
+            Tuple of (needs_clarification, weakness_type, confidence_score, question);
+            question is empty when the model gave none
         """
         # Get brief context for analysis
         context = self.summary_manager.get_context_for_judge("quick", exchange_num, [])
@@ -156,34 +258,32 @@ Respond in this format:
 NEEDS_CLARIFICATION: Yes/No
 WEAKNESS_TYPE: missing_evidence/logical_gaps/vague_language/weak_connections/none
 CONFIDENCE: 0.0-1.0
+QUESTION: If clarification is needed, one concise, professional clarifying question addressed to {speaker}; otherwise none
 BRIEF_REASON: One sentence explanation"""
 
         try:
-            llm = self._get_llm()
-            response = llm.generate_response(prompt, max_tokens=150)
+            # The reason is never used, so stop as soon as the fields we need are in
+            response = self._generate_cached(prompt, max_tokens=220, stop_when=_quality_reply_complete)
             
             # Parse response
-            lines = response.strip().split('\n')
-            needs_clarification = False
-            weakness_type = "none"
+            fields = _labeled_fields(_QUALITY_RE, response)
+            needs_clarification = "yes" in fields.get("NEEDS_CLARIFICATION", "").lower()
+            weakness_type = fields.get("WEAKNESS_TYPE", "none")
             confidence = 0.0
+            if "CONFIDENCE" in fields:
+                try:
+                    confidence = float(fields["CONFIDENCE"])
+                except ValueError:
+                    confidence = 0.5
+            question = fields.get("QUESTION", "")
+            if question.lower().rstrip('.') == "none":
+                question = ""
             
-            for line in lines:
-                if line.startswith("NEEDS_CLARIFICATION:"):
-                    needs_clarification = "yes" in line.lower()
-                elif line.startswith("WEAKNESS_TYPE:"):
-                    weakness_type = line.split(":", 1)[1].strip()
-                elif line.startswith("CONFIDENCE:"):
-                    try:
-                        confidence = float(line.split(":", 1)[1].strip())
-                    except ValueError:
-                        confidence = 0.5
-            
-            return needs_clarification, weakness_type, confidence
+            return needs_clarification, weakness_type, confidence, question
             
         except Exception as e:
             logger.error(f"Error in LLM quality analysis: {e}")
-            return False, "none", 0.0
+            return False, "none", 0.0, ""
     
     def generate_clarifying_question(self, speaker: str, argument: str, weakness_type: str, exchange_num: int) -> str:
         """Generate a targeted clarifying question based on detected weakness.
@@ -229,19 +329,11 @@ Question:"""
         try:
             llm = self._get_llm()
             question = llm.generate_response(prompt, max_tokens=100)
-            question = question.strip()
-            
-            # Ensure question ends with question mark
-            if not question.endswith('?'):
-                question += '?'
+            # Ensure question ends with exactly one question mark
+            question = question.strip().rstrip('?') + '?'
             
             # Log the intervention
-            self.intervention_history.append({
-                "exchange": exchange_num,
-                "speaker": speaker,
-                "weakness_type": weakness_type,
-                "question": question
-            })
+            self.intervention_history.append(Intervention(exchange_num, speaker, weakness_type, question))
             
             return question
             
@@ -275,19 +367,12 @@ ADEQUATE: Yes/No
 ASSESSMENT: Brief explanation (1 sentence)"""
 
         try:
-            llm = self._get_llm()
-            response = llm.generate_response(prompt, max_tokens=100)
+            response = self._generate_cached(prompt, max_tokens=100)
             
             # Parse response
-            lines = response.strip().split('\n')
-            is_adequate = False
-            assessment = "Clarification provided."
-            
-            for line in lines:
-                if line.startswith("ADEQUATE:"):
-                    is_adequate = "yes" in line.lower()
-                elif line.startswith("ASSESSMENT:"):
-                    assessment = line.split(":", 1)[1].strip()
+            fields = _labeled_fields(_EVAL_RE, response)
+            is_adequate = "yes" in fields.get("ADEQUATE", "").lower()
+            assessment = fields.get("ASSESSMENT", "Clarification provided.")
             
             return is_adequate, assessment
             
@@ -304,13 +389,15 @@ ASSESSMENT: Brief explanation (1 sentence)"""
         if not self.intervention_history:
             return {"total_interventions": 0}
         
-        weakness_counts = {}
+        # One pass over the history for both the breakdown and the exchanges
+        weakness_counts = Counter()
+        exchanges = set()
         for intervention in self.intervention_history:
-            weakness_type = intervention["weakness_type"]
-            weakness_counts[weakness_type] = weakness_counts.get(weakness_type, 0) + 1
+            weakness_counts[intervention.weakness_type] += 1
+            exchanges.add(intervention.exchange)
         
         return {
             "total_interventions": len(self.intervention_history),
-            "weakness_breakdown": weakness_counts,
-            "exchanges_with_interventions": len(set(i["exchange"] for i in self.intervention_history))
+            "weakness_breakdown": dict(weakness_counts),
+            "exchanges_with_interventions": len(exchanges)
         }
\ No newline at end of file
@@ -1,12 +1,17 @@
 """LLM wrapper for interfacing with the local GGUF model."""
 
-from llama_cpp import Llama
-from typing import Optional, Dict, Any
+from llama_cpp import Llama, LlamaRAMCache
+from typing import Optional, Dict, Any, Callable
+import json
 import logging
+import threading
 from .config import MODEL_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# The tool decision is a one-line JSON object; don't let it run to the full reply budget
+TOOL_DECISION_MAX_TOKENS = 80
+
 class LocalLLM:
     """Wrapper for the local GGUF model using llama-cpp-python."""
     
@@ -18,6 +23,8 @@ class LocalLLM:
         """
         self.config = model_config or MODEL_CONFIG
         self.llm = None
+        # All agents share this context, so generations must not interleave
+        self._generate_lock = threading.Lock()
         self._initialize_model()
     
     def _initialize_model(self):
@@ -27,20 +34,33 @@ class LocalLLM:
             self.llm = Llama(
                 model_path=self.config["model_path"],
                 n_ctx=self.config["n_ctx"],
-                # n_threads=self.config["n_threads"],
+                n_threads=self.config["n_threads"],
+                n_threads_batch=self.config["n_threads_batch"],
                 verbose=self.config["verbose"],
                 n_gpu_layers=self.config["n_gpu_layers"],
+                n_batch=self.config["n_batch"],
+                main_gpu=self.config["main_gpu"],
             )
+            # Agents share one context and each prompt starts with the speaker's
+            # stable system message, so keep KV states around and let llama.cpp
+            # restore the longest matching prefix instead of re-prefilling it.
+            cache_bytes = self.config.get("prompt_cache_bytes", 0)
+            if cache_bytes:
+                self.llm.set_cache(LlamaRAMCache(capacity_bytes=cache_bytes))
             logger.info("Model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             raise
     
-    def generate_response(self, prompt: str, **kwargs) -> str:
+    def generate_response(self, prompt: str, on_token: Optional[Callable[[str], None]] = None,
+                          stop_when: Optional[Callable[[str], bool]] = None, **kwargs) -> str:
         """Generate a response from the model.
         
         Args:
             prompt: The input prompt
+            on_token: Optional callback receiving each raw text chunk as it is decoded
+            stop_when: Optional predicate called with the text generated so far each
+                time a newline is decoded; generation stops once it returns True
             **kwargs: Additional generation parameters
             
         Returns:
@@ -56,13 +76,31 @@ class LocalLLM:
             "top_p": self.config["top_p"],
             "top_k": self.config["top_k"],
             "repeat_penalty": self.config["repeat_penalty"],
-            "stop": ["<|human|>", "<|assistant|>", "<|system|>", "<|end|>"],
+            "stop": self.config["stop"],
             **kwargs
         }
         
         try:
-            response = self.llm(prompt, **generation_params)
-            text = response["choices"][0]["text"].strip()
+            with self._generate_lock:
+                if on_token or stop_when:
+                    pieces = []
+                    stream = self.llm(prompt, stream=True, **generation_params)
+                    try:
+                        for chunk in stream:
+                            piece = chunk["choices"][0]["text"]
+                            pieces.append(piece)
+                            if on_token:
+                                on_token(piece)
+                            if stop_when and "\n" in piece and stop_when("".join(pieces)):
+                                break
+                    finally:
+                        # Closing the generator ends decoding if we stopped early
+                        stream.close()
+                    text = "".join(pieces)
+                else:
+                    response = self.llm(prompt, **generation_params)
+                    text = response["choices"][0]["text"]
+            text = text.strip()
             
             # Clean up any system artifacts or unwanted text
             # Only include patterns that are clearly meta-commentary or system artifacts
@@ -94,12 +132,13 @@ class LocalLLM:
             logger.error(f"Error generating response: {e}")
             return f"Error: Could not generate response - {str(e)}"
     
-    def create_chat_completion(self, messages: list, tools=None, **kwargs) -> str:
+    def create_chat_completion(self, messages: list, tools=None, on_token: Optional[Callable[[str], None]] = None, **kwargs) -> str:
         """Create a chat completion from a list of messages.
         
         Args:
             messages: List of message dictionaries with 'role' and 'content'
             tools: Available tools for function calling
+            on_token: Optional callback receiving each raw text chunk as it is decoded
             **kwargs: Additional generation parameters
             
         Returns:
@@ -107,7 +146,7 @@ class LocalLLM:
         """
         # Convert messages to a single prompt
         prompt = self._messages_to_prompt(messages, tools)
-        return self.generate_response(prompt, **kwargs)
+        return self.generate_response(prompt, on_token=on_token, **kwargs)
     
     def _messages_to_prompt(self, messages: list, tools=None) -> str:
         """Convert a list of messages to a single prompt string.
@@ -137,13 +176,15 @@ class LocalLLM:
         prompt_parts.append("<|assistant|>")
         return "\n\n".join(prompt_parts)
     
-    def create_chat_completion_with_tools(self, messages: list, tool_manager, max_tool_calls=3) -> str:
+    def create_chat_completion_with_tools(self, messages: list, tool_manager, max_tool_calls=3,
+                                          on_token: Optional[Callable[[str], None]] = None) -> str:
         """Create a chat completion with intelligent tool usage.
         
         Args:
             messages: List of message dictionaries
             tool_manager: Tool manager instance
             max_tool_calls: Maximum number of tool calls to allow
+            on_token: Optional callback streaming the final response (not the tool decision)
             
         Returns:
             Final response after tool calls
@@ -165,16 +206,15 @@ RESPOND WITH THE FOLLOWING FORMAT.
 OR
 {{'need_tool': false}}"""
         })
-        print(tool_decision_messages)
+        logger.debug("Tool decision messages: %s", tool_decision_messages)
         print("🤔 [TOOL DECISION] Asking LLM if it needs tools...")
-        tool_decision = self.create_chat_completion(tool_decision_messages, stop=["response", "Solution"])
-        print(tool_decision)
+        tool_decision = self.create_chat_completion(
+            tool_decision_messages, stop=["response", "Solution"], max_tokens=TOOL_DECISION_MAX_TOKENS
+        )
         print(f"🤔 [TOOL DECISION] LLM response: {tool_decision.strip()}")
         
         # Step 2: Parse the JSON decision
         try:
-            import json
-            
             json_str = tool_decision.strip()
             
             brace_count = 0
@@ -229,12 +269,12 @@ OR
             
             # Step 4: Generate final response with tool context
             print("💬 [FINAL RESPONSE] Generating response with tool results...")
-            return self.create_chat_completion(enhanced_messages)
+            return self.create_chat_completion(enhanced_messages, on_token=on_token)
             
         # Step 5: Generate response without tools
         print("💬 [FINAL RESPONSE] Generating response without tools...")
-        print(messages)
-        return self.create_chat_completion(messages)
+        logger.debug("Final response messages: %s", messages)
+        return self.create_chat_completion(messages, on_token=on_token)
     
     def is_available(self) -> bool:
         """Check if the model is available and ready.
@@ -246,14 +286,21 @@ OR
 
 # Global instance
 _llm_instance = None
+_llm_instance_lock = threading.Lock()
 
 def get_llm() -> LocalLLM:
     """Get the global LLM instance (singleton pattern).
     
+    Every agent shares this one model load and KV cache. llama-cpp-python
+    rewinds the cache to the longest common token prefix on each call, so
+    state from the previous speaker never leaks into the next prompt.
+    
     Returns:
         LocalLLM instance
     """
     global _llm_instance
     if _llm_instance is None:
-        _llm_instance = LocalLLM()
+        with _llm_instance_lock:
+            if _llm_instance is None:
+                _llm_instance = LocalLLM()
     return _llm_instance
\ No newline at end of file
@@ -197,7 +197,8 @@ Examples:
             # Initialize debate manager
             self.debate_manager = DebateManager(
                 topic=topic,
-                enable_moderator=not args.no_moderator
+                enable_moderator=not args.no_moderator,
+                display=self.display
             )
             
             progress.stop()
@@ -13,6 +13,8 @@ class SummaryManager:
         """Initialize the summary manager."""
         self.brief_summaries = {}  # {round: {speaker: brief_summary}}
         self.detailed_summaries = {}  # {round: detailed_summary}
+        self.last_summarized_len = 0  # History length covered by the last update_summaries call
+        self._quick_context_cache = {}  # {round: quick context}; cleared whenever a summary is stored
         self.llm = None
         
     def _get_llm(self):
@@ -53,6 +55,7 @@ Summary:"""
                 summary += '.'
                 
             self.brief_summaries[exchange_num][speaker] = summary
+            self._quick_context_cache.clear()
             logger.debug(f"Generated brief summary for {speaker} in exchange {exchange_num}")
             return summary
             
@@ -61,6 +64,7 @@ Summary:"""
             # Fallback to truncated content
             fallback = content[:150] + "..." if len(content) > 150 else content
             self.brief_summaries[exchange_num][speaker] = fallback
+            self._quick_context_cache.clear()
             return fallback
     
     def generate_detailed_summary(self, exchange_num: int, conversation_history: List[Dict]) -> str:
@@ -84,7 +88,8 @@ Summary:"""
             
         # Create detailed summary prompt
         exchange_content = "\n".join([
-            f"{msg['name']}: {msg['content']}"
+            f"{msg['name']} (clarification): {msg['content']}" if msg.get("is_clarification")
+            else f"{msg['name']}: {msg['content']}"
             for msg in exchange_messages
         ])
         
@@ -105,6 +110,7 @@ Exchange #{exchange_num}:
             summary = summary.strip()
             if summary and len(summary) > 10:  # Ensure we got a meaningful response
                 self.detailed_summaries[exchange_num] = summary
+                self._quick_context_cache.clear()
                 logger.debug(f"Generated detailed summary for exchange {exchange_num}")
                 return summary
             else:
@@ -116,6 +122,7 @@ Exchange #{exchange_num}:
             participant_names = list(set(msg['name'] for msg in exchange_messages))
             fallback = f"Exchange {exchange_num}: Discussion between {', '.join(participant_names)} with {len(exchange_messages)} total contributions. Key topics covered based on the exchange content."
             self.detailed_summaries[exchange_num] = fallback
+            self._quick_context_cache.clear()
             return fallback
     
     def get_context_for_judge(self, decision_type: str, exchange_num: int, 
@@ -146,6 +153,11 @@ Exchange #{exchange_num}:
         Returns:
             Brief context summary
         """
+        # The judge asks for the same round's context several times between summary updates
+        cached = self._quick_context_cache.get(exchange_num)
+        if cached is not None:
+            return cached
+        
         context_parts = []
         
         # Include brief summaries from current round
@@ -159,7 +171,9 @@ Exchange #{exchange_num}:
         if prev_exchange in self.detailed_summaries:
             context_parts.append(f"\nPrevious exchange summary: {self.detailed_summaries[prev_exchange]}")
         
-        return "\n".join(context_parts) if context_parts else "No context available."
+        context = "\n".join(context_parts) if context_parts else "No context available."
+        self._quick_context_cache[exchange_num] = context
+        return context
     
     def _get_detailed_context(self, exchange_num: int, conversation_history: List[Dict]) -> str:
         """Get comprehensive context for final judge evaluation.
@@ -214,14 +228,14 @@ Exchange #{exchange_num}:
         
         return stats
     
-    def get_detailed_summary(self) -> str:
+    def get_detailed_summary(self) -> Optional[str]:
         """Get a comprehensive detailed summary of all rounds.
         
         Returns:
-            Combined detailed summary of all rounds
+            Combined detailed summary of all rounds, or None if none exist yet
         """
         if not self.detailed_summaries:
-            return "No detailed summaries available yet."
+            return None
         
         summary_parts = []
         for exchange_num in sorted(self.detailed_summaries.keys()):
@@ -235,9 +249,16 @@ Exchange #{exchange_num}:
         Args:
             conversation_history: Full conversation history
         """
-        # Find all exchange numbers
+        # Only messages added since the last update can introduce new exchanges;
+        # every exchange seen before already has a summary or a fallback
+        new_messages = conversation_history[self.last_summarized_len:]
+        if not new_messages:
+            return
+        self.last_summarized_len = len(conversation_history)
+        
+        # Find exchange numbers among the new messages
         exchanges = set()
-        for msg in conversation_history:
+        for msg in new_messages:
             if msg.get("exchange", 0) > 0:
                 exchanges.add(msg.get("exchange", 0))
         
@@ -254,4 +275,5 @@ Exchange #{exchange_num}:
                         msg for msg in conversation_history
                         if msg.get("exchange") == exchange_num and msg.get("name") != "System"
                     ]
-                    self.detailed_summaries[exchange_num] = f"Exchange {exchange_num}: {len(exchange_messages)} messages exchanged between participants."
\ No newline at end of file
+                    self.detailed_summaries[exchange_num] = f"Exchange {exchange_num}: {len(exchange_messages)} messages exchanged between participants."
+                    self._quick_context_cache.clear()
\ No newline at end of file
@@ -1,6 +1,7 @@
 """Tool manager for registering and executing tools."""
 
 import logging
+import threading
 from typing import Dict, List, Any, Optional
 from .base_tool import BaseTool
 from .response_parser import ResponseParser
@@ -167,6 +168,7 @@ class ToolManager:
 
 # Global tool manager instance
 _tool_manager_instance = None
+_tool_manager_lock = threading.Lock()
 
 
 def get_tool_manager() -> ToolManager:
@@ -177,5 +179,7 @@ def get_tool_manager() -> ToolManager:
     """
     global _tool_manager_instance
     if _tool_manager_instance is None:
-        _tool_manager_instance = ToolManager()
+        with _tool_manager_lock:
+            if _tool_manager_instance is None:
+                _tool_manager_instance = ToolManager()
     return _tool_manager_instance
\ No newline at end of file
@@ -394,8 +394,7 @@ class DebateLabApp:
                     # Display message
                     avatar = self.get_agent_avatar(current_speaker.name)
                     with st.chat_message("assistant", avatar=avatar):
-                        st.write(f"**{current_speaker.name}:**")
-                        st.write(response)
+                        st.markdown(f"**{current_speaker.name}:**\n\n{response}")
                     
                     conversation_history.append({
                         "name": current_speaker.name,
@@ -553,8 +552,7 @@ Now deliver your response:"""
                     else:
                         avatar = self.get_agent_avatar(msg['name'])
                         with st.chat_message("assistant", avatar=avatar):
-                            st.write(f"**{msg['name']}:**")
-                            st.write(msg['content'])
+                            st.markdown(f"**{msg['name']}:**\n\n{msg['content']}")
     
     def download_debate(self, debate_data: Dict):
         """Prepare debate data for download."""